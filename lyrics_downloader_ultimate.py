@@ -9,23 +9,48 @@ from pathlib import Path
 from tkinter import filedialog, messagebox
 import webbrowser
 import queue
+import logging
+import atexit
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import namedtuple
+
+try:
+    import syncedlyrics
+    # The CLI ran with its output discarded; keep the in-process search just as quiet
+    logging.getLogger("syncedlyrics").setLevel(logging.CRITICAL)
+except ImportError:
+    syncedlyrics = None  # Fall back to the syncedlyrics CLI on PATH
 
 # ------------------ App / Config ------------------
 
 APP_NAME = "Synced Lyrics Downloader"
 CONFIG_FILE = str(Path(__file__).with_name("lyrics_gui_config.json"))
+LYRICS_CACHE_FILE = str(Path(__file__).with_name("lyrics_cache.json"))
 DEFAULT_GITHUB_URL = "https://github.com/type0dev/synced-lyrics-downloader"
 SYNCEDLYRICS_URL = "https://pypi.org/project/syncedlyrics/"
 
 ALL_PROVIDERS = ["Lrclib", "Musixmatch", "Megalobiz", "NetEase", "Genius"]
+_PROVIDER_SET = frozenset(ALL_PROVIDERS)
 
 CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
 TS_RE = re.compile(r"^\s*\[\d{1,2}:\d{2}(?:\.\d{1,3})?\]")
-ICON_STRIP_RE = re.compile(r"^[\U00000080-\U0010ffff\ufe0f]+\s*")
+STRIP_PUNCT_RE = re.compile(r"[^\w\s:-]|_")  # Everything but letters/digits/spaces and - : separators
+RATIO_INPUT_RE = re.compile(r"\d?(?:\.\d{0,3})?")  # Reject-threshold text while typing ("", "0.", "0.15")
+_UTF8_CONT_BYTES = bytes(range(0x80, 0xC0))
+_UTF8_LEAD_BYTES = bytes(range(0xC0, 0x100))
+LRC_META_PREFIXES = ("[ar:", "[ti:", "[al:", "[by:", "[offset:", "[re:", "[ve:")
 
 
 def strip_icon(s: str) -> str:
-    return ICON_STRIP_RE.sub("", s).strip()
+    # Icons are the leading run of non-ASCII code points; called on every
+    # listbox read, so a plain scan instead of a regex
+    i = 0
+    n = len(s)
+    while i < n and ord(s[i]) > 127:
+        i += 1
+    return s[i:].strip()
 
 
 # ------------------ Thread-safe UI queue ------------------
@@ -38,16 +63,55 @@ def ui_call(fn, *args):
 
 
 def pump_ui_queue():
+    items = []
     try:
         while True:
-            fn, args = ui_q.get_nowait()
-            try:
-                fn(*args)
-            except:
-                pass
+            items.append(ui_q.get_nowait())
     except queue.Empty:
         pass
-    root.after(50, pump_ui_queue)
+
+    # Log lines go into the log box as one insert, and only the newest status
+    # is applied; both are held back across each other but not past other calls
+    pending_log = []
+    pending_status = None
+    for fn, args in items:
+        if fn is _log:
+            pending_log.append(args[0])
+            continue
+        if fn is _set_status:
+            pending_status = args
+            continue
+        if pending_log:
+            _flush_log(pending_log)
+        if pending_status:
+            _flush_status(pending_status)
+            pending_status = None
+        try:
+            fn(*args)
+        except:
+            pass
+    if pending_log:
+        _flush_log(pending_log)
+    if pending_status:
+        _flush_status(pending_status)
+
+    # One drain per frame (~60 Hz) while work is flowing, back off when idle
+    root.after(16 if items else 100, pump_ui_queue)
+
+
+def _flush_log(lines: list):
+    try:
+        _log("\n".join(lines))
+    except:
+        pass
+    lines.clear()
+
+
+def _flush_status(args: tuple):
+    try:
+        _set_status(*args)
+    except:
+        pass
 
 
 # ------------------ Popup positioning ------------------
@@ -77,24 +141,62 @@ def popup_over_root(win: tk.Toplevel, width=560, height=180):
 
 # ------------------ Config ------------------
 
+_config_sig = None  # Signature of what's on disk, so unchanged saves are skipped
+
+
+def config_signature(cfg: dict) -> bytes:
+    return hashlib.md5(json.dumps(cfg, sort_keys=True).encode("utf-8")).digest()
+
+
 def load_config():
+    global _config_sig
     if os.path.exists(CONFIG_FILE):
         try:
             with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+                cfg = json.load(f)
+            _config_sig = config_signature(cfg)
+            return cfg
         except:
             return {}
     return {}
 
 
 def save_config(cfg: dict):
+    global _config_sig
     try:
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
+        sig = config_signature(cfg)
+        if sig == _config_sig:
+            return
+        # Write-then-rename so a crash never leaves a half-written config
+        tmp = CONFIG_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
             json.dump(cfg, f, indent=2)
+        os.replace(tmp, CONFIG_FILE)
+        _config_sig = sig
     except:
         pass
 
 
+_config_flush_job = None
+
+
+def schedule_save_config():
+    """save_config(config) half a second after the last call, so a burst of UI
+    changes (theme clicks, resizes) costs one write. flush_config() forces it."""
+    global _config_flush_job
+    if _config_flush_job is not None:
+        root.after_cancel(_config_flush_job)
+    _config_flush_job = root.after(500, flush_config)
+
+
+def flush_config():
+    global _config_flush_job
+    if _config_flush_job is not None:
+        root.after_cancel(_config_flush_job)
+        _config_flush_job = None
+    save_config(config)
+
+
 config = load_config()
 
 # Defaults
@@ -113,13 +215,19 @@ config.setdefault("auto_upgrade_plain", False)  # Auto-upgrade without prompting
 config.setdefault("strip_cjk", True)
 config.setdefault("reject_non_ascii", True)
 config.setdefault("reject_non_ascii_ratio", 0.15)
+config.setdefault("concurrency", 8)  # Tracks downloaded in parallel
 
-save_config(config)
+save_config(config)  # No-op unless a default was just filled in
 
 MUSIC_DIR = config.get("music_dir", "")
 
 # ------------------ Themes ------------------
 
+ThemeColors = namedtuple("ThemeColors", (
+    "bg panel fg btn_bg btn_fg sel_bg sel_fg log_bg log_fg border status_bg status_fg "
+    "link_fg legend_bg legend_border ok warn none plain incomp"
+))
+
 THEMES = {
     "light": {
         "bg": "#f5f5f5",
@@ -166,6 +274,7 @@ THEMES = {
         "incomp": "#fb923c",
     },
 }
+THEMES = {name: ThemeColors(**colors) for name, colors in THEMES.items()}  # t.bg instead of t["bg"]
 
 # ------------------ Windows Titlebar Theme ------------------
 
@@ -217,63 +326,359 @@ def get_plain_provider_order():
     return get_enabled_providers_in_order()
 
 
-def infer_artist_from_path(song_path: str) -> str:
+@functools.lru_cache(maxsize=8192)
+def _infer_artist_cached(song_path: str, music_dir: str) -> str:
     try:
-        rel = os.path.relpath(song_path, MUSIC_DIR)
+        rel = os.path.relpath(song_path, music_dir)
         return rel.split(os.sep, 1)[0]
     except:
         return ""
 
 
+def infer_artist_from_path(song_path: str) -> str:
+    return _infer_artist_cached(song_path, MUSIC_DIR)
+
+
+def artists_of(paths) -> set:
+    """Artist names for a batch of tracks, resolved once per containing folder."""
+    folders = {os.path.dirname(p) for p in paths}
+    names = {_infer_artist_cached(d, MUSIC_DIR) for d in folders}
+    names.difference_update(("", "."))  # "." - loose tracks directly in MUSIC_DIR
+    return names
+
+
+_TITLE_TRANS = str.maketrans({"_": " ", "!": None, "?": None, ":": None, ";": None})
+
+
 def normalize_title(title: str) -> str:
     if " " in title:
         first, rest = title.split(" ", 1)
         if first.isdigit():
             title = rest
-    title = title.replace("_", " ").replace("'", "'")
-    for ch in ["!", "?", ":", ";"]:
-        title = title.replace(ch, "")
+    title = title.translate(_TITLE_TRANS)
     return " ".join(title.split())
 
 
 # ------------------ Status scanning / caching ------------------
 
-lyrics_cache = {}
+lyrics_cache = {}  # {(path, dir_signature, CACHE_ARTIST | CACHE_ALBUM): {"total", "have"}}
+CACHE_ARTIST = 0
+CACHE_ALBUM = 1
+SIG_DEPTH = {CACHE_ARTIST: 2, CACHE_ALBUM: 1}  # dir_signature depth per cache kind
+_cache_by_artist = {}  # {artist_path: {lyrics_cache keys}} - lets invalidation skip a full scan
+_artist_icon_cache = {}  # {artist: icon or ""} - what the artist list renders from
 missing_targets = []
 scanned_artists = set()  # Track which artists have been scanned for selective icon display
 
 
-def quick_mtime(folder: str) -> int:
-    """Fast mtime check - only looks at folder and immediate subfolders, not every file.
-    Good enough to detect new albums/tracks added without walking the whole tree."""
-    newest = 0
+def _ipath(p: str) -> str:
+    """Interned cache-key path - repeat lookups hash once and compare by identity."""
+    return sys.intern(p)
+
+
+def _cache_put(key, res):
+    """Store a scan result in lyrics_cache and index it under its artist folder."""
+    path, _, kind = key
+    artist_path = path if kind == CACHE_ARTIST else os.path.dirname(path)
+    lyrics_cache[key] = res
+    _cache_by_artist.setdefault(artist_path, set()).add(key)
+
+
+def dir_signature(folder: str, depth: int = 1) -> int:
+    """Cheap cache key - newest mtime of folder and its subfolders down to depth
+    levels, without listing any files. A new .lrc only bumps the mtime of the
+    folder it lands in, so an album needs depth 1 to see Album/CD1 and an artist
+    depth 2 to see Artist/Album/CD1."""
+    sig = 0
     try:
-        newest = max(newest, int(os.path.getmtime(folder)))
-        for entry in os.scandir(folder):
-            if entry.is_dir():
-                newest = max(newest, int(entry.stat().st_mtime))
+        sig = os.stat(folder).st_mtime_ns
+        if depth > 0:
+            with os.scandir(folder) as it:
+                subdirs = [e.path for e in it if e.is_dir(follow_symlinks=False)]
+            for sub in subdirs:
+                m = dir_signature(sub, depth - 1)
+                if m > sig:
+                    sig = m
     except:
         pass
-    return newest
+    return sig
 
 
-def scan_folder_completeness(folder: str):
+_AUDIO_EXTS = frozenset((".mp3", ".flac"))
+_SCAN_EXTS = _AUDIO_EXTS | {".lrc"}
+
+
+def scan_tree(folder: str, tracks=None, _rel: str = ""):
+    """Single scandir pass over a folder tree.
+    Returns (total_audio, have_lrc) - the .lrc pairing is matched from the
+    directory listing itself, so no exists() or stat() per track. Names are
+    compared normcase'd, so it ignores case wherever exists() would (Windows).
+    If tracks is a list, audio paths relative to folder are appended to it in
+    display order (files sorted, then each subfolder)."""
     total = 0
     have = 0
+    audio = []
+    lrc_names = set()
+    subdirs = []
     try:
-        for root_dir, _, files in os.walk(folder):
-            for f in files:
-                if f.lower().endswith((".mp3", ".flac")):
-                    total += 1
-                    base = os.path.splitext(os.path.join(root_dir, f))[0]
-                    lrc = base + ".lrc"
-                    if os.path.exists(lrc):
-                        have += 1
-    except:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry)
+                    continue
+                stem, ext = os.path.splitext(entry.name)
+                ext = ext.lower()
+                if ext not in _SCAN_EXTS:
+                    continue
+                if ext == ".lrc":
+                    lrc_names.add(os.path.normcase(entry.name))
+                else:
+                    audio.append((entry.name, stem))
+    except OSError:
         pass
+
+    total += len(audio)
+    have += sum(1 for _, stem in audio if os.path.normcase(stem + ".lrc") in lrc_names)
+    if tracks is not None:
+        audio.sort()
+        subdirs.sort(key=lambda e: e.name)
+        tracks.extend(_rel + name for name, _ in audio)
+
+    for entry in subdirs:
+        sub_rel = _rel + entry.name + os.sep if tracks is not None else ""
+        sub_total, sub_have = scan_tree(entry.path, tracks, sub_rel)
+        total += sub_total
+        have += sub_have
+    return total, have
+
+
+def list_tracks(folder: str, out=None) -> list:
+    """Full paths of every track under folder, files sorted before each subfolder.
+    A plain scandir walk like find_missing - no .lrc pairing and no stats."""
+    if out is None:
+        out = []
+    audio = []
+    subdirs = []
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in _AUDIO_EXTS:
+                    audio.append(entry.path)
+    except OSError:
+        pass
+
+    out.extend(sorted(audio))
+    for sub in sorted(subdirs):
+        list_tracks(sub, out)
+    return out
+
+
+def find_missing(folder: str, out: dict):
+    """Add every track under folder that has no sibling .lrc to out (path -> None).
+    Same one-scandir-per-directory pairing as scan_tree, without stats."""
+    audio = []
+    lrc_names = set()
+    subdirs = []
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                stem, ext = os.path.splitext(entry.name)
+                ext = ext.lower()
+                if ext == ".lrc":
+                    lrc_names.add(os.path.normcase(entry.name))
+                elif ext in _AUDIO_EXTS:
+                    audio.append((stem, entry.path))
+    except OSError:
+        pass
+
+    for stem, path in audio:
+        if os.path.normcase(stem + ".lrc") not in lrc_names:
+            out[path] = None
+    for sub in subdirs:
+        find_missing(sub, out)
+
+
+def find_missing_in(roots) -> dict:
+    """find_missing over several roots, read in parallel; keeps the roots' order."""
+    missing = {}
+    if len(roots) == 1:
+        find_missing(roots[0], missing)
+        return missing
+
+    def one(folder):
+        out = {}
+        find_missing(folder, out)
+        return out
+
+    # Own short-lived pool: _SCAN_POOL may be queued up with a library index
+    with ThreadPoolExecutor(max_workers=min(16, len(roots))) as ex:
+        for out in ex.map(one, roots):
+            missing.update(out)
+    return missing
+
+
+def scan_folder_completeness(folder: str):
+    total, have = scan_tree(folder)
     return {"total": total, "have": have}
 
 
+# ------------------ Library index ------------------
+
+LIB_INDEX = {}  # {artist: {album: {"total", "have", "sig", "tracks"}}}
+
+
+def index_album(album_path: str, sig=None) -> dict:
+    tracks = []
+    if sig is None:
+        sig = dir_signature(album_path)
+    total, have = scan_tree(album_path, tracks)
+    return {"total": total, "have": have, "sig": sig, "tracks": tracks}
+
+
+def index_artist(artist_path: str):
+    try:
+        with os.scandir(artist_path) as it:
+            album_entries = [e for e in it if e.is_dir(follow_symlinks=False)]
+    except OSError:
+        return None
+    return {album.name: index_album(album.path) for album in album_entries}
+
+
+# Directory reads are latency-bound (especially on NAS/SMB), so artists are indexed in parallel
+_SCAN_POOL = ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 4) * 2))
+
+
+def index_library(root_dir: str, on_artist=None) -> dict:
+    """Enumerate the whole library once, so selecting artists/albums is a dict lookup.
+    on_artist(name, albums) is called as each artist finishes."""
+    index = {}
+    try:
+        with os.scandir(root_dir) as it:
+            artist_entries = [e for e in it if e.is_dir(follow_symlinks=False)]
+    except OSError:
+        return index
+
+    futures = {_SCAN_POOL.submit(index_artist, e.path): e.name for e in artist_entries}
+    for fut in as_completed(futures):
+        try:
+            albums = fut.result()
+        except:
+            continue
+        if albums is None:
+            continue
+        name = futures[fut]
+        index[name] = albums
+        if on_artist:
+            on_artist(name, albums)
+    return index
+
+
+def start_library_index():
+    root_dir = MUSIC_DIR
+
+    def on_artist(name, albums):
+        if root_dir == MUSIC_DIR:  # Folder may have changed while indexing
+            LIB_INDEX[name] = albums
+
+    threading.Thread(target=index_library, args=(root_dir, on_artist), daemon=True).start()
+
+
+def album_index(artist: str, album: str, sig=None) -> dict:
+    """LIB_INDEX entry for one album, re-indexed in place if its folder changed."""
+    album_path = os.path.join(MUSIC_DIR, artist, album)
+    if sig is None:
+        sig = dir_signature(album_path)
+    albums = LIB_INDEX.setdefault(artist, {})
+    entry = albums.get(album)
+    if entry is None or entry["sig"] != sig:
+        entry = index_album(album_path, sig)
+        albums[album] = entry
+    return entry
+
+
+def load_lyrics_cache():
+    """Re-adopt scan results saved by the last session: {path: [sig, total, have, ..., kind]}"""
+    try:
+        with open(LYRICS_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for path, row in data.items():
+            sig, total, have, kind = row[0], row[1], row[2], row[-1]  # Older files also stored a mtime
+            if kind in (CACHE_ARTIST, CACHE_ALBUM):
+                _cache_put((_ipath(path), sig, kind), {"total": total, "have": have})
+    except:
+        pass
+
+
+def save_lyrics_cache():
+    data = {}
+    for key, res in list(lyrics_cache.items()):  # Snapshot: workers may still be writing to it at exit
+        path, sig, kind = key
+        data[path] = [sig, res["total"], res["have"], kind]
+    try:
+        with open(LYRICS_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    except:
+        pass
+
+
+def prune_lyrics_cache():
+    """Drop cached scans whose folder signature changed since they were taken.
+    Signatures are read on a background thread (a tree of stats on big/NAS
+    libraries); until _apply_prune lands, entries show their cached icons."""
+    _artist_icon_cache.clear()
+    keys = list(lyrics_cache)
+    if not keys:
+        return
+
+    def check():
+        sigs = {}
+        stale = []
+        for key in keys:
+            path, sig, kind = key
+            if path not in sigs:
+                sigs[path] = dir_signature(path, SIG_DEPTH[kind])
+            if sigs[path] != sig:
+                stale.append(key)
+        ui_call(_apply_prune, keys, stale)
+
+    # Own thread: _SCAN_POOL is about to be queued up with the library index
+    threading.Thread(target=check, daemon=True).start()
+
+
+def _apply_prune(keys, stale):
+    """UI-thread half of prune_lyrics_cache. Artists that survive count as
+    scanned, so their icons come back on launch."""
+    stale_artists = set()
+    for key in stale:
+        path, _, kind = key
+        artist_path = path if kind == CACHE_ARTIST else os.path.dirname(path)
+        if lyrics_cache.pop(key, None) is not None:
+            _cache_by_artist.get(artist_path, set()).discard(key)
+            stale_artists.add(os.path.basename(artist_path))
+    stale = set(stale)
+    for key in keys:
+        path, _, kind = key
+        if kind == CACHE_ARTIST and key not in stale and key in lyrics_cache and os.path.dirname(path) == MUSIC_DIR:
+            scanned_artists.add(os.path.basename(path))
+
+    if stale_artists:
+        for artist in stale_artists:
+            _artist_icon_cache.pop(artist, None)
+        rebuild_artist_list_filtered(keep_selection_name=get_selected_artist_name())
+
+
+def invalidate_artist_cache(artist: str):
+    """Forget cached scan results for an artist and its albums."""
+    for k in _cache_by_artist.pop(os.path.join(MUSIC_DIR, artist), ()):
+        lyrics_cache.pop(k, None)
+    _artist_icon_cache.pop(artist, None)
+
+
 def completeness_icon(have: int, total: int) -> str:
     if total <= 0 or have == 0:
         return "⬜"
@@ -282,28 +687,58 @@ def completeness_icon(have: int, total: int) -> str:
     return "🟨"
 
 
+def _classify_lrc_lines(lines) -> str:
+    # Streamed: a synced file is decided within its first few lines
+    startswith = str.startswith
+    match = TS_RE.match
+    lyric_count = 0
+    ts_count = 0
+    for raw in lines:
+        ln = raw.strip()
+        if not ln or startswith(ln, LRC_META_PREFIXES):
+            continue
+        lyric_count += 1
+        if match(ln):
+            ts_count += 1
+        if ts_count >= 3 and lyric_count >= 6:
+            return "synced"
+
+    if lyric_count < 6:
+        return "incomplete"
+    return "plain"
+
+
 def analyze_lrc(lrc_path: str) -> str:
     if not os.path.exists(lrc_path):
         return "none"
     try:
         with open(lrc_path, "r", encoding="utf-8", errors="ignore") as f:
-            lines = [ln.strip() for ln in f.read().splitlines()]
+            return _classify_lrc_lines(f)
     except:
         return "none"
 
-    lyric_lines = []
-    for ln in lines:
-        if not ln:
-            continue
-        if ln.startswith(("[ar:", "[ti:", "[al:", "[by:", "[offset:", "[re:", "[ve:")):
-            continue
-        lyric_lines.append(ln)
 
-    if len(lyric_lines) < 6:
-        return "incomplete"
+def analyze_lrc_text(text: str) -> str:
+    """analyze_lrc for lyrics that are still in memory."""
+    return _classify_lrc_lines(text.splitlines())
+
 
-    ts_lines = sum(1 for ln in lyric_lines if TS_RE.match(ln))
-    return "synced" if ts_lines >= 3 else "plain"
+_LRC_STATE_CACHE = {}  # {lrc_path: ((st_mtime_ns, st_size), state)}
+
+
+def cached_analyze_lrc(lrc_path: str) -> str:
+    """analyze_lrc, skipped when the file hasn't changed since the last look."""
+    try:
+        st = os.stat(lrc_path)
+    except OSError:
+        return "none"
+    sig = (st.st_mtime_ns, st.st_size)
+    hit = _LRC_STATE_CACHE.get(lrc_path)
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+    state = analyze_lrc(lrc_path)
+    _LRC_STATE_CACHE[lrc_path] = (sig, state)
+    return state
 
 
 def track_icon_for_state(state: str) -> str:
@@ -323,13 +758,13 @@ def _set_status(text: str, color: str = "normal"):
     
     # Set color based on type
     if color == "success":
-        status_label.configure(fg=t["ok"])
+        status_label.configure(fg=t.ok)
     elif color == "error":
-        status_label.configure(fg=t["incomp"])
+        status_label.configure(fg=t.incomp)
     elif color == "working":
-        status_label.configure(fg=t["plain"])
+        status_label.configure(fg=t.plain)
     else:
-        status_label.configure(fg=t["status_fg"])
+        status_label.configure(fg=t.status_fg)
 
 
 def set_status(text: str, color: str = "normal"):
@@ -351,45 +786,60 @@ def log(msg: str):
         ui_call(_log, msg)
 
 
+def _set_buttons_state(state: str):
+    """Enable/disable the action buttons in one go; Cancel gets the opposite state."""
+    for b in (dl_btn, open_btn, custom_btn, missing_scan_btn, missing_dl_btn):
+        b.configure(state=state)
+    cancel_btn.configure(state=("normal" if state == "disabled" else "disabled"))
+
+
 # ------------------ Artist filtering ------------------
 
 all_artists = []
 
+
+def artist_icon(name: str) -> str:
+    """Completeness icon for an artist ("" if never scanned). May hit the disk;
+    rebuild_artist_list_filtered only calls it on an _artist_icon_cache miss."""
+    ap = _ipath(os.path.join(MUSIC_DIR, name))
+    # Check if we have a cached result for this artist
+    cached = next((lyrics_cache.get(k) for k in tuple(_cache_by_artist.get(ap, ()))
+                   if k[2] == CACHE_ARTIST), None)
+    if cached is not None:
+        # Show icon from cache - no scanning needed
+        return completeness_icon(cached["have"], cached["total"])
+    elif name in scanned_artists:
+        # Scanned this session but not cached yet - do quick scan
+        res = scan_folder_completeness(ap)
+        _cache_put((ap, dir_signature(ap, SIG_DEPTH[CACHE_ARTIST]), CACHE_ARTIST), res)
+        return completeness_icon(res["have"], res["total"])
+    # Never scanned - no icon
+    return ""
+
+
+_rendered_query = None  # Filter the artist list was last built with
+
+
 def rebuild_artist_list_filtered(keep_selection_name=None):
+    global _rendered_query
     artist_list.delete(0, tk.END)
     q = search_var.get().strip().lower() if 'search_var' in globals() else ""
+    _rendered_query = q
 
-    def add_artist(name: str):
-        ap = os.path.join(MUSIC_DIR, name)
-        # Check if we have a cached result for this artist
-        cached = next((v for k, v in lyrics_cache.items()
-                       if isinstance(k, tuple) and k[0] == ap and k[2] == "artist"), None)
-        if cached is not None:
-            # Show icon from cache - no scanning needed
-            icon = completeness_icon(cached["have"], cached["total"])
-            artist_list.insert(tk.END, f"{icon} {name}")
-        elif name in scanned_artists:
-            # Scanned this session but not cached yet - do quick scan
-            newest = quick_mtime(ap)
-            key = (ap, newest, "artist")
-            lyrics_cache[key] = scan_folder_completeness(ap)
-            icon = completeness_icon(lyrics_cache[key]["have"], lyrics_cache[key]["total"])
-            artist_list.insert(tk.END, f"{icon} {name}")
-        else:
-            # Never scanned - no icon
-            artist_list.insert(tk.END, name)
+    def artist_row(name: str) -> str:
+        icon = _artist_icon_cache.get(name)
+        if icon is None:
+            icon = _artist_icon_cache[name] = artist_icon(name)
+        return f"{icon} {name}" if icon else name
 
-    if not q:
-        for a in all_artists:
-            add_artist(a)
-    else:
-        for a in all_artists:
-            if q in a.lower():
-                add_artist(a)
+    names = [a for a in all_artists if q in a.lower()] if q else all_artists
+    rows = [artist_row(a) for a in names]
+    if rows:
+        artist_list.insert(tk.END, *rows)  # One Tcl call for the whole list
 
     if keep_selection_name:
-        for i in range(artist_list.size()):
-            if strip_icon(artist_list.get(i)) == keep_selection_name:
+        for i, name in enumerate(names):
+            if name == keep_selection_name:
                 artist_list.selection_set(i)
                 artist_list.activate(i)
                 artist_list.see(i)  # Scroll to keep selected artist in view
@@ -417,7 +867,7 @@ class ToolTip:
         
         t = THEMES[config.get("theme", "dark")]
         label = tk.Label(tw, text=self.text, justify='left',
-                        background=t["panel"], foreground=t["fg"],
+                        background=t.panel, foreground=t.fg,
                         relief='solid', borderwidth=1,
                         font=("Segoe UI", 9), padx=8, pady=4)
         label.pack()
@@ -445,6 +895,16 @@ def setup_keyboard_shortcuts():
 
 # ------------------ Refresh helpers ------------------
 
+def lb_get_selected(lb, sel=None):
+    """Return the selected item strings of a Listbox with one Tk get().
+    Pass sel when the caller already holds curselection()."""
+    if sel is None:
+        sel = lb.curselection()
+    if len(sel) <= 1:
+        return [lb.get(i) for i in sel]
+    items = lb.get(0, tk.END)
+    return [items[i] for i in sel]
+
 def get_selected_artist_name():
     if not artist_list.curselection():
         return None
@@ -461,7 +921,8 @@ def refresh_artist_list(keep_selection=True):
     sel_artist = get_selected_artist_name() if keep_selection else None
 
     try:
-        artists = [a for a in sorted(os.listdir(MUSIC_DIR)) if os.path.isdir(os.path.join(MUSIC_DIR, a))]
+        with os.scandir(MUSIC_DIR) as it:
+            artists = sorted(e.name for e in it if e.is_dir())
     except:
         artists = []
 
@@ -503,14 +964,18 @@ def load_artists():
     log(f"Loaded artists from: {MUSIC_DIR}")
     log(f"Config file: {CONFIG_FILE}")
 
-    lyrics_cache.clear()
+    global LIB_INDEX
+    LIB_INDEX = {}
+    start_library_index()
+
+    prune_lyrics_cache()
     refresh_artist_list(keep_selection=False)
 
 
 def update_missing_dl_button_state():
     """Enable Download Missing button if any selected artists are scanned and might have missing items"""
     # Check if any selected artists have been scanned
-    selected_artists = [strip_icon(artist_list.get(i)) for i in artist_list.curselection()]
+    selected_artists = [strip_icon(x) for x in lb_get_selected(artist_list)]
     
     has_scanned = any(artist in scanned_artists for artist in selected_artists)
     
@@ -534,47 +999,49 @@ def on_artist_select(event=None):
     else:
         update_missing_dl_button_state()
 
-    # Update button text based on selection
-    if artist_list.curselection():
-        if len(artist_list.curselection()) == artist_list.size() and artist_list.size() > 0:
-            artist_select_btn.configure(text="Clear All")
-        else:
-            artist_select_btn.configure(text="Select All")
+    # Update button text based on selection (read once - each call copies the whole tuple)
+    sel = artist_list.curselection()
+    if sel and len(sel) == artist_list.size():
+        artist_select_btn.configure(text="Clear All")
     else:
         artist_select_btn.configure(text="Select All")
 
     album_list.delete(0, tk.END)
     track_list.delete(0, tk.END)
 
-    if not artist_list.curselection():
+    if not sel:
         return
 
-    if len(artist_list.curselection()) > 1:
-        set_status(f"{len(artist_list.curselection())} artists selected")
+    if len(sel) > 1:
+        set_status(f"{len(sel)} artists selected")
         return
 
-    artist = strip_icon(artist_list.get(artist_list.curselection()[0]))
+    artist = strip_icon(artist_list.get(sel[0]))
     artist_path = os.path.join(MUSIC_DIR, artist)
 
     try:
-        albums = [a for a in sorted(os.listdir(artist_path)) if os.path.isdir(os.path.join(artist_path, a))]
+        with os.scandir(artist_path) as it:
+            albums = sorted(e.name for e in it if e.is_dir())
     except:
         return
 
     # Show icons only if this artist has been scanned
+    rows = []
     if artist in scanned_artists:
         for album in albums:
-            ap = os.path.join(artist_path, album)
-            newest = quick_mtime(ap)
-            key = (ap, newest, "album")
+            ap = _ipath(os.path.join(artist_path, album))
+            sig = dir_signature(ap)
+            key = (ap, sig, CACHE_ALBUM)
             if key not in lyrics_cache:
-                lyrics_cache[key] = scan_folder_completeness(ap)
+                entry = album_index(artist, album, sig)
+                _cache_put(key, {"total": entry["total"], "have": entry["have"]})
             res = lyrics_cache[key]
             icon = completeness_icon(res["have"], res["total"])
-            album_list.insert(tk.END, f"{icon} {album}")
+            rows.append(f"{icon} {album}")
     else:
-        for album in albums:
-            album_list.insert(tk.END, album)
+        rows = albums
+    if rows:
+        album_list.insert(tk.END, *rows)
 
     set_status(f"{artist} — {album_list.size()} albums")
 
@@ -603,25 +1070,24 @@ def on_album_select(event=None):
     track_list.delete(0, tk.END)
 
     # Update button text based on selection
+    album_sel = album_list.curselection()
     if album_list.size() > 0:
-        if album_list.curselection():
-            if len(album_list.curselection()) == album_list.size():
-                album_select_btn.configure(text="Clear All")
-            else:
-                album_select_btn.configure(text="Select All")
+        if album_sel and len(album_sel) == album_list.size():
+            album_select_btn.configure(text="Clear All")
         else:
             album_select_btn.configure(text="Select All")
     
-    if not artist_list.curselection():
+    artist_sel = artist_list.curselection()
+    if not artist_sel:
         return
-    if len(artist_list.curselection()) > 1:
+    if len(artist_sel) > 1:
         set_status("Multiple artists selected (track list not shown)")
         return
 
-    artist = strip_icon(artist_list.get(artist_list.curselection()[0]))
+    artist = strip_icon(artist_list.get(artist_sel[0]))
     artist_path = os.path.join(MUSIC_DIR, artist)
 
-    sel_albums_disp = [album_list.get(i) for i in album_list.curselection()]
+    sel_albums_disp = lb_get_selected(album_list, album_sel)
     if not sel_albums_disp:
         # Don't auto-select if we just cleared selection
         return
@@ -630,32 +1096,29 @@ def on_album_select(event=None):
     combined = (len(sel_albums) > 1)
 
     total_tracks = 0
+    rows = []
     show_icons = artist in scanned_artists  # Only show icons if artist has been scanned
     
     for album in sel_albums:
         album_path = os.path.join(artist_path, album)
         try:
-            for root_dir, _, files in os.walk(album_path):
-                for file in sorted(files):
-                    if file.lower().endswith((".mp3", ".flac")):
-                        rel_to_album = os.path.relpath(os.path.join(root_dir, file), album_path)
-                        track_path = os.path.join(album_path, rel_to_album)
-                        lrc_path = os.path.splitext(track_path)[0] + ".lrc"
-
-                        prefix = ""
-                        if show_icons:
-                            if os.path.exists(lrc_path):
-                                state = analyze_lrc(lrc_path)
-                            else:
-                                state = "none"
-                            prefix = f"{track_icon_for_state(state)} "
-
-                        display = f"{album}{os.sep}{rel_to_album}" if combined else rel_to_album
-                        track_list.insert(tk.END, prefix + display)
-                        total_tracks += 1
+            for rel_to_album in album_index(artist, album)["tracks"]:
+                track_path = os.path.join(album_path, rel_to_album)
+                lrc_path = os.path.splitext(track_path)[0] + ".lrc"
+
+                prefix = ""
+                if show_icons:
+                    prefix = f"{track_icon_for_state(cached_analyze_lrc(lrc_path))} "
+
+                display = f"{album}{os.sep}{rel_to_album}" if combined else rel_to_album
+                rows.append(prefix + display)
+                total_tracks += 1
         except:
             pass
 
+    if rows:
+        track_list.insert(tk.END, *rows)
+
     if len(sel_albums) == 1:
         set_status(f"{artist} / {sel_albums[0]} — {total_tracks} tracks")
     else:
@@ -664,6 +1127,30 @@ def on_album_select(event=None):
 
 # ------------------ Lyrics helpers ------------------
 
+PROVIDER_TIMEOUT = 15  # Seconds before a stuck provider run is given up on
+
+def search_provider(query: str, provider: str, lang_code: str, want_synced: bool) -> str:
+    """syncedlyrics.search bounded by PROVIDER_TIMEOUT ("" on error or timeout).
+    Runs on a daemon thread, so a hung provider is abandoned instead of holding
+    a download worker or keeping the process alive at exit."""
+    result = []
+
+    def work():
+        try:
+            result.append(syncedlyrics.search(
+                query, providers=[provider],
+                synced_only=want_synced, plain_only=not want_synced,
+                lang=lang_code or None
+            ) or "")
+        except:
+            pass
+
+    th = threading.Thread(target=work, daemon=True)
+    th.start()
+    th.join(PROVIDER_TIMEOUT)
+    return result[0] if result else ""
+
+
 def run_provider(query: str, provider: str, out_path: str, lang_code: str, want_synced: bool) -> bool:
     if os.path.exists(out_path):
         try:
@@ -671,15 +1158,44 @@ def run_provider(query: str, provider: str, out_path: str, lang_code: str, want_
         except:
             pass
 
-    cmd = ["syncedlyrics", query, "-p", provider, "-o", out_path]
-    cmd.append("--synced-only" if want_synced else "--plain-only")
-    if lang_code:
-        cmd.extend(["--lang", lang_code])
+    if syncedlyrics is not None:
+        result = search_provider(query, provider, lang_code, want_synced)
+        if result:
+            try:
+                Path(out_path).write_text(result, encoding="utf-8")
+            except:
+                pass
+    else:
+        cmd = ["syncedlyrics", query, "-p", provider, "-o", out_path]
+        cmd.append("--synced-only" if want_synced else "--plain-only")
+        if lang_code:
+            cmd.extend(["--lang", lang_code])
 
-    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           timeout=PROVIDER_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            try:
+                os.remove(out_path)  # Don't keep a half-written file from a killed run
+            except:
+                pass
     return os.path.exists(out_path) and os.path.getsize(out_path) > 50
 
 
+def fetch_provider_text(query: str, provider: str, lang_code: str, want_synced: bool, scratch_path: str) -> str:
+    """Lyrics from one provider as text ("" if none), without writing them anywhere
+    when syncedlyrics is importable. The CLI fallback goes through scratch_path."""
+    if syncedlyrics is not None:
+        text = search_provider(query, provider, lang_code, want_synced)
+        return text if len(text.encode("utf-8")) > 50 else ""  # Same cutoff as run_provider
+    if not run_provider(query, provider, scratch_path, lang_code, want_synced):
+        return ""
+    try:
+        return Path(scratch_path).read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return ""
+
+
 def ask_upgrade_plain_lyrics(song_name: str) -> tuple[bool, bool]:
     """
     Ask user what to do with plain lyrics file.
@@ -689,7 +1205,7 @@ def ask_upgrade_plain_lyrics(song_name: str) -> tuple[bool, bool]:
     
     dialog = tk.Toplevel(root)
     dialog.title("Plain Lyrics Found")
-    dialog.configure(bg=t["bg"])
+    dialog.configure(bg=t.bg)
     dialog.grab_set()
     dialog.resizable(False, False)
     
@@ -702,47 +1218,43 @@ def ask_upgrade_plain_lyrics(song_name: str) -> tuple[bool, bool]:
     result = {"rename": False, "upgrade": False}
     
     # Message
-    msg_frame = tk.Frame(dialog, bg=t["bg"])
+    msg_frame = tk.Frame(dialog, bg=t.bg)
     msg_frame.pack(fill="x", padx=20, pady=(20, 10))
     
     tk.Label(
         msg_frame,
         text=f"Plain lyrics file saved as .lrc:",
-        bg=t["bg"], fg=t["fg"],
+        bg=t.bg, fg=t.fg,
         font=("Segoe UI", 10, "bold")
     ).pack(anchor="w")
     
     tk.Label(
         msg_frame,
         text=song_name,
-        bg=t["bg"], fg=t["fg"],
+        bg=t.bg, fg=t.fg,
         font=("Segoe UI", 9)
     ).pack(anchor="w", padx=20, pady=(5, 10))
     
     # Checkboxes
-    check_frame = tk.Frame(dialog, bg=t["bg"])
+    check_frame = tk.Frame(dialog, bg=t.bg)
     check_frame.pack(fill="x", padx=20, pady=10)
     
     rename_var = tk.BooleanVar(value=True)
     tk.Checkbutton(
         check_frame,
         text="Rename .lrc → .txt (recommended for plain lyrics)",
-        variable=rename_var,
-        bg=t["bg"], fg=t["fg"], selectcolor=t["bg"],
-        activebackground=t["bg"], activeforeground=t["fg"]
+        variable=rename_var
     ).pack(anchor="w")
     
     upgrade_var = tk.BooleanVar(value=True)
     tk.Checkbutton(
         check_frame,
         text="Try to find synced version (may take a moment)",
-        variable=upgrade_var,
-        bg=t["bg"], fg=t["fg"], selectcolor=t["bg"],
-        activebackground=t["bg"], activeforeground=t["fg"]
+        variable=upgrade_var
     ).pack(anchor="w", pady=(5, 0))
     
     # Buttons
-    btn_frame = tk.Frame(dialog, bg=t["bg"])
+    btn_frame = tk.Frame(dialog, bg=t.bg)
     btn_frame.pack(fill="x", padx=20, pady=(10, 20))
     
     def on_ok():
@@ -759,8 +1271,8 @@ def ask_upgrade_plain_lyrics(song_name: str) -> tuple[bool, bool]:
         btn_frame,
         text="OK",
         command=on_ok,
-        bg=t["btn_bg"], fg=t["btn_fg"],
-        activebackground=t["btn_bg"], activeforeground=t["btn_fg"],
+        bg=t.btn_bg, fg=t.btn_fg,
+        activebackground=t.btn_bg, activeforeground=t.btn_fg,
         width=10
     ).pack(side="left", padx=(0, 10))
     
@@ -768,8 +1280,8 @@ def ask_upgrade_plain_lyrics(song_name: str) -> tuple[bool, bool]:
         btn_frame,
         text="Skip",
         command=on_skip,
-        bg=t["btn_bg"], fg=t["btn_fg"],
-        activebackground=t["btn_bg"], activeforeground=t["btn_fg"],
+        bg=t.btn_bg, fg=t.btn_fg,
+        activebackground=t.btn_bg, activeforeground=t.btn_fg,
         width=10
     ).pack(side="left")
     
@@ -784,17 +1296,20 @@ def strip_cjk_lines_in_lrc(path: str) -> bool:
     except:
         return False
 
+    startswith = str.startswith
+    search = CJK_RE.search
     kept = []
     changed = False
     for line in lines:
-        if line.startswith(("[ar:", "[ti:", "[al:", "[by:", "[offset:", "[re:", "[ve:")):
+        if startswith(line, LRC_META_PREFIXES):
             kept.append(line)
             continue
-        if "]" in line:
-            text = line.rsplit("]", 1)[-1].strip()
-            if text and CJK_RE.search(text):
-                changed = True
-                continue
+        # Lyric text is whatever follows the last "]"; search it in place
+        # rather than slicing it out
+        end = line.rfind("]")
+        if end != -1 and search(line, end + 1):
+            changed = True
+            continue
         kept.append(line)
 
     try:
@@ -838,13 +1353,17 @@ def reject_if_mostly_non_ascii(path: str) -> bool:
 
     ratio_limit = float(config.get("reject_non_ascii_ratio", 0.15))
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
+        with open(path, "rb") as f:
+            data = f.read()
     except:
         return False
 
-    non_ascii = sum(1 for c in content if ord(c) > 127)
-    ratio = non_ascii / max(len(content), 1)
+    # Count characters straight from the UTF-8 bytes: every non-ASCII character
+    # has exactly one lead byte, and continuation bytes aren't characters at all
+    non_ascii = len(data) - len(data.translate(None, _UTF8_LEAD_BYTES))
+    chars = len(data.translate(None, _UTF8_CONT_BYTES))
+    chars -= data.count(b"\r\n")  # Text-mode reads made each CRLF one character
+    ratio = non_ascii / max(chars, 1)
 
     if ratio > ratio_limit:
         try:
@@ -858,34 +1377,35 @@ def reject_if_mostly_non_ascii(path: str) -> bool:
 # ------------------ Download (thread + cancel) ------------------
 
 downloading = False
-cancel_requested = False
+cancel_event = threading.Event()  # Set by Cancel; workers poll it between steps
 upgrade_all_session = False  # Session-level "Yes to All" for upgrades
 
 
 def start_download():
-    global cancel_requested, upgrade_all_session
+    global upgrade_all_session
     if downloading:
         return
-    cancel_requested = False
+    cancel_event.clear()
     upgrade_all_session = False  # Reset "Yes to All" for new download session
     cancel_btn.configure(state="normal")
     threading.Thread(target=download_selected, daemon=True).start()
 
 
 def request_cancel():
-    global cancel_requested
     if not downloading:
         return
-    cancel_requested = True
+    cancel_event.set()
     set_status("Cancel requested…")
     log("⚠ Cancel requested — stopping after current step.")
 
 
 def should_cancel():
-    return cancel_requested
+    return cancel_event.is_set()
 
 
-def resolve_track_display_to_path(artist: str, display: str) -> str:
+def resolve_track_display_to_path(artist: str, display: str, sel_albums=None) -> str:
+    """sel_albums: the stripped album selection, when the caller already has it
+    (saves re-reading the album listbox once per track)."""
     display = strip_icon(display)
     base_artist = os.path.join(MUSIC_DIR, artist)
 
@@ -893,7 +1413,8 @@ def resolve_track_display_to_path(artist: str, display: str) -> str:
     if len(parts) == 2:
         return os.path.join(base_artist, parts[0], parts[1])
 
-    sel_albums = [strip_icon(album_list.get(i)) for i in album_list.curselection()]
+    if sel_albums is None:
+        sel_albums = [strip_icon(x) for x in lb_get_selected(album_list)]
     if not sel_albums and album_list.size() > 0:
         sel_albums = [strip_icon(album_list.get(0))]
     if sel_albums:
@@ -901,224 +1422,209 @@ def resolve_track_display_to_path(artist: str, display: str) -> str:
     return os.path.join(base_artist, display)
 
 
-def download_selected():
-    global downloading, missing_targets, upgrade_all_session
-
-    if not artist_list.curselection() and not album_list.curselection() and not track_list.curselection():
-        ui_call(messagebox.showwarning, "Select", "Select an artist/album/track first.")
-        ui_call(cancel_btn.configure, {"state": "disabled"})
-        return
-    if not MUSIC_DIR or not os.path.isdir(MUSIC_DIR):
-        ui_call(messagebox.showwarning, "Music folder", "Pick a valid music folder first.")
-        ui_call(cancel_btn.configure, {"state": "disabled"})
-        return
+_download_pool = None  # Pool of the running download, so closing the window can stop it
 
-    downloading = True
-    ui_call(dl_btn.configure, {"state": "disabled"})
-    ui_call(open_btn.configure, {"state": "disabled"})
-    ui_call(custom_btn.configure, {"state": "disabled"})
-    ui_call(missing_scan_btn.configure, {"state": "disabled"})
-    ui_call(missing_dl_btn.configure, {"state": "disabled"})
 
-    selected_artists_disp = [artist_list.get(i) for i in artist_list.curselection()]
-    selected_artists = [strip_icon(a) for a in selected_artists_disp]
-    targets = []
+def _download_queue(targets, **kwargs):
+    """Fetch lyrics for targets on the worker pool, then restore the UI.
+    Callers have already set downloading and disabled the buttons. Without
+    allow_upgrade_prompt, plain .lrc files are upgraded without asking."""
+    global downloading, _download_pool
+    try:
+        _run_download_queue(targets, **kwargs)
+    finally:
+        # Even if the queue blew up, don't leave the app stuck in "Busy"
+        _download_pool = None
+        downloading = False
+        ui_call(_set_buttons_state, "normal")
 
-    if len(selected_artists) > 1:
-        for artist in selected_artists:
-            base_path = os.path.join(MUSIC_DIR, artist)
-            for root_dir, _, files in os.walk(base_path):
-                for f in files:
-                    if f.lower().endswith((".mp3", ".flac")):
-                        targets.append(os.path.join(root_dir, f))
-    else:
-        artist = selected_artists[0] if selected_artists else None
 
-        if not artist:
-            log("Nothing selected. Pick an artist/album/track.")
-            set_status("Select an artist/album/track.")
-            downloading = False
-            ui_call(dl_btn.configure, {"state": "normal"})
-            ui_call(open_btn.configure, {"state": "normal"})
-            ui_call(custom_btn.configure, {"state": "normal"})
-            ui_call(missing_scan_btn.configure, {"state": "normal"})
-            ui_call(missing_dl_btn.configure, {"state": "normal"})
-            ui_call(cancel_btn.configure, {"state": "disabled"})
-            return
-        else:
-            base_artist = os.path.join(MUSIC_DIR, artist)
-            sel_albums = [strip_icon(album_list.get(i)) for i in album_list.curselection()]
+def _download_concurrency() -> int:
+    try:
+        return max(1, int(config.get("concurrency", 8)))
+    except (TypeError, ValueError):
+        return 8
 
-            if track_list.curselection():
-                for i in track_list.curselection():
-                    path = resolve_track_display_to_path(artist, track_list.get(i))
-                    if os.path.isfile(path) and path.lower().endswith((".mp3", ".flac")):
-                        targets.append(path)
 
-            elif sel_albums:
-                for album in sel_albums:
-                    album_path = os.path.join(base_artist, album)
-                    for root_dir, _, files in os.walk(album_path):
-                        for f in files:
-                            if f.lower().endswith((".mp3", ".flac")):
-                                targets.append(os.path.join(root_dir, f))
-            else:
-                for root_dir, _, files in os.walk(base_artist):
-                    for f in files:
-                        if f.lower().endswith((".mp3", ".flac")):
-                            targets.append(os.path.join(root_dir, f))
+def _run_download_queue(targets, *, allow_upgrade_prompt: bool, status_prefix: str, fallback_artist: str = ""):
+    global missing_targets, scanned_artists, _download_pool
 
-    seen = set()
-    deduped = []
-    for p in targets:
-        if p not in seen:
-            seen.add(p)
-            deduped.append(p)
-    targets = deduped
+    # Song.mp3 and Song.flac share Song.lrc - fetching both at once would race on it
+    unique = {}
+    for song in targets:
+        unique.setdefault(os.path.normcase(os.path.splitext(song)[0]), song)
+    targets = list(unique.values())
 
     providers_synced = get_synced_provider_order()
     providers_plain = get_plain_provider_order()
     lang_code = get_lang_code()
     plain_ok = allow_plain_fallback()
+    upgrade_plain = bool(config.get("upgrade_plain_to_synced", True))
+    auto_upgrade = (not allow_upgrade_prompt) or bool(config.get("auto_upgrade_plain", False))
+    strip_cjk = bool(config.get("strip_cjk", True))
 
     total = len(targets)
-    set_status(f"Downloading… ({total} tracks)", "working")
-    log(f"\nProcessing {total} tracks...\n")
+    set_status(f"{status_prefix}… ({total} tracks)", "working")
+    # The missing queue never prompts, so it keeps its own, shorter upgrade wording
+    sub = "      " if allow_upgrade_prompt else "   "
+    log(f"\nProcessing {total} {'tracks' if allow_upgrade_prompt else 'missing tracks'}...\n")
     
     success_count = 0
     failed_count = 0
+    prompt_lock = threading.Lock()
+
+    # Network-bound, so tracks are fetched in parallel; returns True/False for
+    # downloaded/failed and None when nothing was attempted
+    def fetch_lyrics_for_track(idx, song):
+        lines = []
+        try:
+            return _fetch_one(idx, song, lines.append)
+        finally:
+            if lines:
+                log("\n".join(lines))  # Keep each track's lines together in the log
 
-    for idx, song in enumerate(targets, 1):
+    def _fetch_one(idx, song, log):
+        global upgrade_all_session
         if should_cancel():
-            log("🛑 Cancelled by user.")
-            break
+            return None
 
         lrc = os.path.splitext(song)[0] + ".lrc"
         
         song_name = os.path.basename(song)
         title = normalize_title(os.path.splitext(song_name)[0])
 
-        set_status(f"[{idx}/{total}] {song_name}", "working")
         log(f"[{idx}/{total}] Searching: {title}")
 
         # Check if we already have lyrics
         existing_lrc_state = None
         if os.path.exists(lrc):
-            existing_lrc_state = analyze_lrc(lrc)
+            existing_lrc_state = cached_analyze_lrc(lrc)
 
             # If plain lyrics exist and upgrade is enabled, ask user
-            if existing_lrc_state == "plain" and config.get("upgrade_plain_to_synced", True):
-                log("   ℹ Found plain lyrics (.lrc file)")
+            if existing_lrc_state == "plain" and upgrade_plain:
+                if allow_upgrade_prompt:
+                    log("   ℹ Found plain lyrics (.lrc file)")
+                else:
+                    log("   ℹ Found plain lyrics - searching for synced version...")
 
                 # Check if auto-upgrade is enabled or session-level "yes to all" is set
-                should_upgrade = config.get("auto_upgrade_plain", False) or upgrade_all_session
+                should_upgrade = auto_upgrade or upgrade_all_session
 
                 if not should_upgrade:
-                    # Show dialog with Yes/No/Yes to All options
-                    ui_result = {"done": False, "upgrade": False, "upgrade_all": False}
-
-                    def ask_on_main():
-                        # Custom dialog with 3 buttons
-                        dialog = tk.Toplevel(root)
-                        dialog.title("Upgrade Plain Lyrics?")
-                        dialog.transient(root)
-                        dialog.grab_set()
-                        
-                        # Center on parent
-                        root.update_idletasks()
-                        dialog_w = 400
-                        dialog_h = 150
-                        x = root.winfo_x() + (root.winfo_width() - dialog_w) // 2
-                        y = root.winfo_y() + (root.winfo_height() - dialog_h) // 2
-                        dialog.geometry(f"{dialog_w}x{dialog_h}+{x}+{y}")
-                        
-                        msg = f"Found plain lyrics for:\n{song_name}\n\nSearch for a synced version?"
-                        tk.Label(dialog, text=msg, padx=20, pady=20, wraplength=360).pack()
-                        
-                        btn_frame = tk.Frame(dialog)
-                        btn_frame.pack(pady=10)
-                        
-                        def on_yes():
-                            ui_result["upgrade"] = True
-                            ui_result["done"] = True
-                            dialog.destroy()
-                        
-                        def on_yes_all():
-                            ui_result["upgrade"] = True
-                            ui_result["upgrade_all"] = True
-                            ui_result["done"] = True
-                            dialog.destroy()
-                        
-                        def on_no():
-                            ui_result["upgrade"] = False
-                            ui_result["done"] = True
-                            dialog.destroy()
-                        
-                        tk.Button(btn_frame, text="Yes", command=on_yes, width=10).pack(side="left", padx=5)
-                        tk.Button(btn_frame, text="Yes to All", command=on_yes_all, width=10).pack(side="left", padx=5)
-                        tk.Button(btn_frame, text="No", command=on_no, width=10).pack(side="left", padx=5)
-                        
-                        dialog.protocol("WM_DELETE_WINDOW", on_no)
-
-                    ui_call(ask_on_main)
-                    while not ui_result["done"]:
-                        if should_cancel():
-                            break
-                        import time
-                        time.sleep(0.1)
+                    # One prompt at a time; an earlier one may have answered "Yes to All"
+                    with prompt_lock:
+                        if upgrade_all_session:
+                            should_upgrade = True
+                        else:
+                            # Show dialog with Yes/No/Yes to All options
+                            answered = threading.Event()
+                            ui_result = {"upgrade": False, "upgrade_all": False}
+
+                            def ask_on_main():
+                                # Custom dialog with 3 buttons
+                                dialog = tk.Toplevel(root)
+                                dialog.title("Upgrade Plain Lyrics?")
+                                dialog.transient(root)
+                                dialog.grab_set()
+
+                                # Center on parent
+                                root.update_idletasks()
+                                dialog_w = 400
+                                dialog_h = 150
+                                x = root.winfo_x() + (root.winfo_width() - dialog_w) // 2
+                                y = root.winfo_y() + (root.winfo_height() - dialog_h) // 2
+                                dialog.geometry(f"{dialog_w}x{dialog_h}+{x}+{y}")
+
+                                msg = f"Found plain lyrics for:\n{song_name}\n\nSearch for a synced version?"
+                                tk.Label(dialog, text=msg, padx=20, pady=20, wraplength=360).pack()
+
+                                btn_frame = tk.Frame(dialog)
+                                btn_frame.pack(pady=10)
+
+                                def on_yes():
+                                    ui_result["upgrade"] = True
+                                    answered.set()
+                                    dialog.destroy()
+
+                                def on_yes_all():
+                                    ui_result["upgrade"] = True
+                                    ui_result["upgrade_all"] = True
+                                    answered.set()
+                                    dialog.destroy()
+
+                                def on_no():
+                                    ui_result["upgrade"] = False
+                                    answered.set()
+                                    dialog.destroy()
+
+                                tk.Button(btn_frame, text="Yes", command=on_yes, width=10).pack(side="left", padx=5)
+                                tk.Button(btn_frame, text="Yes to All", command=on_yes_all, width=10).pack(side="left", padx=5)
+                                tk.Button(btn_frame, text="No", command=on_no, width=10).pack(side="left", padx=5)
+
+                                dialog.protocol("WM_DELETE_WINDOW", on_no)
+
+                            ui_call(ask_on_main)
+                            while not answered.wait(timeout=0.25):
+                                if should_cancel():
+                                    break
 
-                    if should_cancel():
-                        break
-                    
-                    # Set session-level flag if "Yes to All" was clicked
-                    if ui_result["upgrade_all"]:
-                        upgrade_all_session = True
-                    
-                    should_upgrade = ui_result["upgrade"]
-                else:
+                            if should_cancel():
+                                return None
+
+                            # Set session-level flag if "Yes to All" was clicked
+                            if ui_result["upgrade_all"]:
+                                upgrade_all_session = True
+
+                            should_upgrade = ui_result["upgrade"]
+                elif allow_upgrade_prompt:
                     log("   🔄 Auto-upgrading (setting enabled or 'Yes to All' selected)")
 
+                result = None
                 if should_upgrade:
-                    log("   🔄 Searching for synced version...")
-                    inferred_artist = infer_artist_from_path(song) or (selected_artists[0] if selected_artists else "")
+                    if allow_upgrade_prompt:
+                        log("   🔄 Searching for synced version...")
+                    inferred_artist = infer_artist_from_path(song) or fallback_artist
                     query = f"{title} {inferred_artist}".strip()
 
                     found_synced = False
                     for p in providers_synced:
                         if should_cancel():
                             break
-                        log(f"      trying synced: {p}")
+                        log(f"{sub}trying synced: {p}")
                         temp_lrc = lrc + ".temp"
-                        if run_provider(query, p, temp_lrc, lang_code, want_synced=True):
-                            if analyze_lrc(temp_lrc) == "synced":
-                                try:
-                                    os.remove(lrc)
-                                    os.rename(temp_lrc, lrc)
-                                    log(f"      ⬆ Upgraded plain → synced [{p}]")
-                                    success_count += 1
-                                    found_synced = True
-                                    break
-                                except:
-                                    pass
-                            else:
+                        try:
+                            # Judged in memory; only a synced result touches the disk
+                            text = fetch_provider_text(query, p, lang_code, True, temp_lrc)
+                            if text and analyze_lrc_text(text) == "synced":
+                                Path(temp_lrc).write_text(text, encoding="utf-8")
+                                os.replace(temp_lrc, lrc)  # Atomic - the plain file stays until this succeeds
+                                _LRC_STATE_CACHE.pop(lrc, None)
+                                log(f"{sub}⬆ Upgraded plain → synced [{p}]")
+                                result = True
+                                found_synced = True
+                                break
+                        except OSError:
+                            pass
+                        finally:
+                            if os.path.exists(temp_lrc):
                                 try:
                                     os.remove(temp_lrc)
-                                except:
+                                except OSError:
                                     pass
 
                     if not found_synced:
-                        log("      ↪ No synced version found, keeping plain .lrc")
+                        log(f"{sub}↪ No synced version found, keeping plain {'.lrc' if allow_upgrade_prompt else 'lyrics'}")
                 else:
                     log("   ↪ Skipped upgrade, keeping plain .lrc")
 
-                continue  # Move to next song
+                return result  # Move to next song
 
             # Skip if .lrc already exists (synced, plain, or incomplete)
             if existing_lrc_state in ("synced", "incomplete"):
                 log(f"   ↪ Skip (already has .lrc)")
-                continue
+                return None
 
-        inferred_artist = infer_artist_from_path(song) or (selected_artists[0] if selected_artists else "")
+        inferred_artist = infer_artist_from_path(song) or fallback_artist
         query = f"{title} {inferred_artist}".strip()
 
         used = None
@@ -1142,37 +1648,53 @@ def download_selected():
                     break
 
         if os.path.exists(lrc):
-            if config.get("strip_cjk", True):
+            if strip_cjk:
                 if strip_cjk_lines_in_lrc(lrc):
                     log("   🧹 Stripped CJK lines")
 
             if reject_if_mostly_non_ascii(lrc):
                 log(f"   ⚠ Rejected (mostly non-ASCII) [{used}/{mode}]")
-                failed_count += 1
-                continue
+                return False
 
             log(f"   ✔ Saved [{used}/{mode}]")
-            success_count += 1
+            return True
         else:
             log("   ✖ Not found")
+            return False
+
+    pool = _download_pool = ThreadPoolExecutor(max_workers=_download_concurrency())
+    futures = {pool.submit(fetch_lyrics_for_track, idx, song): song for idx, song in enumerate(targets, 1)}
+    done_count = 0
+    cancelled = False
+    # No cancel_futures here: as_completed never hears about cancelled futures and
+    # would wait on them forever. Queued tracks see the flag and return None at once.
+    for fut in as_completed(futures):
+        if should_cancel() and not cancelled:
+            cancelled = True
+            log("🛑 Cancelled by user.")
+        done_count += 1
+        try:
+            ok = fut.result()
+        except:
+            ok = False
+        if ok is True:
+            success_count += 1
+        elif ok is False:
             failed_count += 1
+        set_status(f"[{done_count}/{total}] {os.path.basename(futures[fut])}", "working")
+    pool.shutdown(wait=True)
 
     log("\nDone.\n")
     
     # Show detailed results
-    if cancel_requested:
-        set_status(f"Cancelled. Downloaded: {success_count}/{total} ({failed_count} failed)")
+    if cancel_event.is_set():
+        set_status(f"Cancelled. Downloaded: {success_count}/{total} ({failed_count} failed)", "error")
     else:
-        set_status(f"Done. Downloaded: {success_count}/{total} ({failed_count} failed)", color="success")
+        set_status(f"Done. Downloaded: {success_count}/{total} ({failed_count} failed)", "success")
 
     # Store which items were downloaded and mark as scanned
-    global scanned_artists
-    temp_scanned = set()
-    for song in targets:
-        artist = infer_artist_from_path(song)
-        if artist:
-            temp_scanned.add(artist)
-            scanned_artists.add(artist)  # Mark for icon display
+    temp_scanned = artists_of(targets)
+    scanned_artists |= temp_scanned  # Mark for icon display
 
     missing_targets = []
     ui_call(missing_scan_btn.configure, {"text": "Scan Missing (Selection) [0]"})
@@ -1180,21 +1702,69 @@ def download_selected():
     
     # Clear cache for downloaded artists to force rescan with updated icons
     for artist in temp_scanned:
-        ap = os.path.join(MUSIC_DIR, artist)
-        keys_to_remove = [k for k in lyrics_cache.keys() if isinstance(k, tuple) and k[0].startswith(ap)]
-        for k in keys_to_remove:
-            lyrics_cache.pop(k, None)
+        invalidate_artist_cache(artist)
     
     ui_call(refresh_artist_list, True)
     ui_call(refresh_current_view)
 
-    downloading = False
-    ui_call(dl_btn.configure, {"state": "normal"})
-    ui_call(open_btn.configure, {"state": "normal"})
-    ui_call(custom_btn.configure, {"state": "normal"})
-    ui_call(missing_scan_btn.configure, {"state": "normal"})
-    ui_call(missing_dl_btn.configure, {"state": "normal"})
-    ui_call(cancel_btn.configure, {"state": "disabled"})
+
+def download_selected():
+    global downloading
+
+    if not artist_list.curselection() and not album_list.curselection() and not track_list.curselection():
+        ui_call(messagebox.showwarning, "Select", "Select an artist/album/track first.")
+        ui_call(cancel_btn.configure, {"state": "disabled"})
+        return
+    if not MUSIC_DIR or not os.path.isdir(MUSIC_DIR):
+        ui_call(messagebox.showwarning, "Music folder", "Pick a valid music folder first.")
+        ui_call(cancel_btn.configure, {"state": "disabled"})
+        return
+
+    downloading = True
+    ui_call(_set_buttons_state, "disabled")
+
+    selected_artists_disp = lb_get_selected(artist_list)
+    selected_artists = [strip_icon(a) for a in selected_artists_disp]
+    targets = []
+
+    if len(selected_artists) > 1:
+        for artist in selected_artists:
+            targets.extend(list_tracks(os.path.join(MUSIC_DIR, artist)))
+    else:
+        artist = selected_artists[0] if selected_artists else None
+
+        if not artist:
+            log("Nothing selected. Pick an artist/album/track.")
+            set_status("Select an artist/album/track.")
+            downloading = False
+            ui_call(_set_buttons_state, "normal")
+            return
+        else:
+            base_artist = os.path.join(MUSIC_DIR, artist)
+            sel_albums = [strip_icon(x) for x in lb_get_selected(album_list)]
+
+            if track_list.curselection():
+                for disp in lb_get_selected(track_list):
+                    path = resolve_track_display_to_path(artist, disp, sel_albums)
+                    if os.path.splitext(path)[1].lower() in _AUDIO_EXTS and os.path.isfile(path):
+                        targets.append(path)
+
+            elif sel_albums:
+                for album in sel_albums:
+                    targets.extend(list_tracks(os.path.join(base_artist, album)))
+            else:
+                targets.extend(list_tracks(base_artist))
+
+    seen = set()
+    deduped = []
+    for p in targets:
+        if p not in seen:
+            seen.add(p)
+            deduped.append(p)
+    targets = deduped
+
+    _download_queue(targets, allow_upgrade_prompt=True, status_prefix="Downloading",
+                    fallback_artist=selected_artists[0] if selected_artists else "")
 
 
 # ------------------ Missing (Selection-only) ------------------
@@ -1206,7 +1776,7 @@ def build_missing_for_selection():
     if not MUSIC_DIR or not os.path.isdir(MUSIC_DIR):
         return
 
-    selected_artists = [strip_icon(artist_list.get(i)) for i in artist_list.curselection()]
+    selected_artists = [strip_icon(x) for x in lb_get_selected(artist_list)]
 
     if not selected_artists:
         log("Missing scan: no artist selected (selection-only).")
@@ -1217,7 +1787,7 @@ def build_missing_for_selection():
     if len(selected_artists) > 1:
         item_desc = f"{len(selected_artists)} artists"
     else:
-        sel_albums = [strip_icon(album_list.get(i)) for i in album_list.curselection()]
+        sel_albums = [strip_icon(x) for x in lb_get_selected(album_list)]
         if track_list.curselection():
             item_desc = f"{len(track_list.curselection())} tracks"
         elif sel_albums:
@@ -1228,48 +1798,27 @@ def build_missing_for_selection():
     set_status(f"Scanning {item_desc}...")
     log(f"Scanning {item_desc}...")
 
+    missing = {}  # Insertion-ordered, so duplicates collapse in place
+
     if len(selected_artists) > 1:
-        roots = [os.path.join(MUSIC_DIR, a) for a in selected_artists]
-        for root_dir in roots:
-            for rd, _, files in os.walk(root_dir):
-                for f in files:
-                    if f.lower().endswith((".mp3", ".flac")):
-                        song = os.path.join(rd, f)
-                        lrc = os.path.splitext(song)[0] + ".lrc"
-                        
-                        
-                        if not os.path.exists(lrc):
-                            missing_targets.append(song)
+        missing.update(find_missing_in([os.path.join(MUSIC_DIR, a) for a in selected_artists]))
     else:
         artist = selected_artists[0]
         base_artist = os.path.join(MUSIC_DIR, artist)
+        sel_albums = [strip_icon(x) for x in lb_get_selected(album_list)]
 
         if track_list.curselection():
-            for i in track_list.curselection():
-                song = resolve_track_display_to_path(artist, track_list.get(i))
-                if os.path.isfile(song) and song.lower().endswith((".mp3", ".flac")):
+            for disp in lb_get_selected(track_list):
+                song = resolve_track_display_to_path(artist, disp, sel_albums)
+                if os.path.splitext(song)[1].lower() in _AUDIO_EXTS and os.path.isfile(song):
                     lrc = os.path.splitext(song)[0] + ".lrc"
-                    
-                    
                     if not os.path.exists(lrc):
-                        missing_targets.append(song)
+                        missing[song] = None
         else:
-            sel_albums = [strip_icon(album_list.get(i)) for i in album_list.curselection()]
             roots = [os.path.join(base_artist, alb) for alb in sel_albums] if sel_albums else [base_artist]
+            missing.update(find_missing_in(roots))
 
-            for root_dir in roots:
-                for rd, _, files in os.walk(root_dir):
-                    for f in files:
-                        if f.lower().endswith((".mp3", ".flac")):
-                            song = os.path.join(rd, f)
-                            lrc = os.path.splitext(song)[0] + ".lrc"
-                            
-                            
-                            if not os.path.exists(lrc):
-                                missing_targets.append(song)
-
-    seen = set()
-    missing_targets = [p for p in missing_targets if not (p in seen or seen.add(p))]
+    missing_targets = list(missing)
 
     log(f"Missing scan (selection): {len(missing_targets)} tracks missing .lrc")
     set_status(f"Missing: {len(missing_targets)} tracks without lyrics")
@@ -1285,10 +1834,7 @@ def build_missing_for_selection():
     
     # Clear cache for scanned items to force rescan with icons
     for artist in selected_artists:
-        ap = os.path.join(MUSIC_DIR, artist)
-        keys_to_remove = [k for k in lyrics_cache.keys() if isinstance(k, tuple) and k[0].startswith(ap)]
-        for k in keys_to_remove:
-            lyrics_cache.pop(k, None)
+        invalidate_artist_cache(artist)
     
     # Refresh the view to show icons for scanned items
     refresh_artist_list(keep_selection=True)
@@ -1309,12 +1855,13 @@ def start_download_missing():
         messagebox.showinfo("Missing", "No missing tracks found for this selection.")
         return
 
+    cancel_event.clear()
     cancel_btn.configure(state="normal")
     threading.Thread(target=download_missing_queue, daemon=True).start()
 
 
 def download_missing_queue():
-    global downloading, missing_targets
+    global downloading
 
     if not missing_targets:
         return
@@ -1322,161 +1869,11 @@ def download_missing_queue():
         return
 
     downloading = True
-    ui_call(dl_btn.configure, {"state": "disabled"})
-    ui_call(open_btn.configure, {"state": "disabled"})
-    ui_call(custom_btn.configure, {"state": "disabled"})
-    ui_call(missing_scan_btn.configure, {"state": "disabled"})
-    ui_call(missing_dl_btn.configure, {"state": "disabled"})
+    ui_call(_set_buttons_state, "disabled")
 
     targets = list(missing_targets)
-    providers_synced = get_synced_provider_order()
-    providers_plain = get_plain_provider_order()
-    lang_code = get_lang_code()
-    plain_ok = allow_plain_fallback()
 
-    total = len(targets)
-    set_status(f"Downloading missing… ({total} tracks)", "working")
-    log(f"\nProcessing {total} missing tracks...\n")
-    
-    success_count = 0
-    failed_count = 0
-
-    for idx, song in enumerate(targets, 1):
-        if should_cancel():
-            log("🛑 Cancelled by user.")
-            break
-
-        lrc = os.path.splitext(song)[0] + ".lrc"
-        
-        song_name = os.path.basename(song)
-        title = normalize_title(os.path.splitext(song_name)[0])
-
-        set_status(f"[{idx}/{total}] {song_name}", "working")
-        log(f"[{idx}/{total}] Searching: {title}")
-
-        # Check if we already have lyrics
-        existing_lrc_state = None
-        if os.path.exists(lrc):
-            existing_lrc_state = analyze_lrc(lrc)
-            
-            # If plain lyrics exist and upgrade is enabled, try to find synced version
-            if existing_lrc_state == "plain" and config.get("upgrade_plain_to_synced", True):
-                log("   ℹ Found plain lyrics - searching for synced version...")
-                
-                inferred_artist = infer_artist_from_path(song)
-                query = f"{title} {inferred_artist}".strip()
-                
-                # Try to find synced version
-                found_synced = False
-                for p in providers_synced:
-                    if should_cancel():
-                        break
-                    log(f"   trying synced: {p}")
-                    
-                    # Save to temp file first
-                    temp_lrc = lrc + ".temp"
-                    if run_provider(query, p, temp_lrc, lang_code, want_synced=True):
-                        # Check if it's actually synced
-                        if analyze_lrc(temp_lrc) == "synced":
-                            # Replace plain with synced
-                            try:
-                                os.remove(lrc)
-                                os.rename(temp_lrc, lrc)
-                                log(f"   ⬆ Upgraded plain → synced [{p}]")
-                                success_count += 1
-                                found_synced = True
-                                break
-                            except:
-                                pass
-                        else:
-                            # Not actually synced, remove temp
-                            try:
-                                os.remove(temp_lrc)
-                            except:
-                                pass
-                
-                if not found_synced:
-                    log("   ↪ No synced version found, keeping plain lyrics")
-                
-                continue  # Move to next song
-
-        inferred_artist = infer_artist_from_path(song)
-        query = f"{title} {inferred_artist}".strip()
-
-        used = None
-        mode = None
-
-        for p in providers_synced:
-            if should_cancel():
-                break
-            log(f"   trying synced: {p}")
-            if run_provider(query, p, lrc, lang_code, want_synced=True):
-                used, mode = p, "synced"
-                break
-
-        if (not os.path.exists(lrc)) and plain_ok and (not should_cancel()):
-            for p in providers_plain:
-                if should_cancel():
-                    break
-                log(f"   trying plain: {p}")
-                if run_provider(query, p, lrc, lang_code, want_synced=False):
-                    used, mode = p, "plain"
-                    break
-
-        if os.path.exists(lrc):
-            if config.get("strip_cjk", True):
-                if strip_cjk_lines_in_lrc(lrc):
-                    log("   🧹 Stripped CJK lines")
-
-            if reject_if_mostly_non_ascii(lrc):
-                log(f"   ⚠ Rejected (mostly non-ASCII) [{used}/{mode}]")
-                failed_count += 1
-                continue
-
-            log(f"   ✔ Saved [{used}/{mode}]")
-            success_count += 1
-        else:
-            log("   ✖ Not found")
-            failed_count += 1
-
-    log("\nDone.\n")
-    
-    # Show detailed results with color
-    if cancel_requested:
-        set_status(f"Cancelled. Downloaded: {success_count}/{total} ({failed_count} failed)", "error")
-    else:
-        set_status(f"Done. Downloaded: {success_count}/{total} ({failed_count} failed)", "success")
-
-    # Mark artists as scanned and clear their cache
-    global scanned_artists
-    temp_scanned = set()
-    for song in targets:
-        artist = infer_artist_from_path(song)
-        if artist:
-            temp_scanned.add(artist)
-            scanned_artists.add(artist)  # Mark for icon display
-
-    missing_targets = []
-    ui_call(missing_scan_btn.configure, {"text": "Scan Missing (Selection) [0]"})
-    ui_call(missing_dl_btn.configure, {"state": "disabled"})
-    
-    # Clear cache for scanned artists to force rescan with updated icons
-    for artist in temp_scanned:
-        ap = os.path.join(MUSIC_DIR, artist)
-        keys_to_remove = [k for k in lyrics_cache.keys() if isinstance(k, tuple) and k[0].startswith(ap)]
-        for k in keys_to_remove:
-            lyrics_cache.pop(k, None)
-    
-    ui_call(refresh_artist_list, True)
-    ui_call(refresh_current_view)
-
-    downloading = False
-    ui_call(dl_btn.configure, {"state": "normal"})
-    ui_call(open_btn.configure, {"state": "normal"})
-    ui_call(custom_btn.configure, {"state": "normal"})
-    ui_call(missing_scan_btn.configure, {"state": "normal"})
-    ui_call(missing_dl_btn.configure, {"state": "normal"})
-    ui_call(cancel_btn.configure, {"state": "disabled"})
+    _download_queue(targets, allow_upgrade_prompt=False, status_prefix="Downloading missing")
 
 
 # ------------------ Custom Search ------------------
@@ -1506,7 +1903,7 @@ def open_custom_search():
     title_guess = normalize_title(os.path.splitext(os.path.basename(song_path))[0])
     
     # Build query as: Artist: Album - Track
-    sel_albums = [strip_icon(album_list.get(i)) for i in album_list.curselection()]
+    sel_albums = [strip_icon(x) for x in lb_get_selected(album_list)]
     album_guess = sel_albums[0] if sel_albums else ""
     
     if album_guess:
@@ -1516,67 +1913,51 @@ def open_custom_search():
 
     def apply_strip_punctuation(s: str) -> str:
         """Remove all punctuation, keep only letters, numbers, spaces and hyphens as separators"""
-        result = ""
-        for ch in s:
-            if ch == "-":
-                result += ch  # Keep hyphens as separators
-            elif ch == ":":
-                result += ch  # Keep colons as separators
-            elif ch.isalnum() or ch.isspace():
-                result += ch
-            # Strip everything else: apostrophes, commas, periods, !, ?, ', etc.
+        result = STRIP_PUNCT_RE.sub("", s)  # Apostrophes, commas, periods, !, ?, etc.
         return " ".join(result.split())  # Clean up extra spaces
 
     t = THEMES[config.get("theme", "dark")]
     win = tk.Toplevel(root)
     win.title("Custom Search")
-    win.configure(bg=t["bg"])
+    win.configure(bg=t.bg)
     win.grab_set()
     popup_over_root(win, 580, 270)
 
-    tk.Label(win, text="Search query to use:", bg=t["bg"], fg=t["fg"],
+    tk.Label(win, text="Search query to use:", bg=t.bg, fg=t.fg,
              font=("Segoe UI", 9, "bold")).pack(anchor="w", padx=12, pady=(12, 4))
 
     qvar = tk.StringVar(value=default_query)
-    entry = tk.Entry(win, textvariable=qvar, bg=t["panel"], fg=t["fg"],
-                     insertbackground=t["fg"], font=("Segoe UI", 10))
+    entry = tk.Entry(win, textvariable=qvar, bg=t.panel, fg=t.fg,
+                     insertbackground=t.fg, font=("Segoe UI", 10))
     entry.pack(fill="x", padx=12)
     entry.focus_set()
     entry.selection_range(0, tk.END)
 
     hint = "Tip: remove stuff like (remix), (live), feat., etc."
-    tk.Label(win, text=hint, bg=t["bg"], fg=t["fg"],
+    tk.Label(win, text=hint, bg=t.bg, fg=t.fg,
              font=("Segoe UI", 8)).pack(anchor="w", padx=12, pady=(4, 6))
 
     # Strip punctuation checkbox
     strip_var = tk.BooleanVar(value=False)
     dedup_var = tk.BooleanVar(value=False)
 
+    # Matches if: exact artist, OR artist followed by space/colon/comma
+    # e.g. "Cypress Hill feat ..." or "Boyz II Men: Album" or "Boyz II Men"
+    artist_re = re.compile(re.escape(artist) + r"(?=$|[ :,])", re.IGNORECASE)
+
     def clean_query(s: str) -> str:
         result = s
         if dedup_var.get():
             parts = result.split(" - ")
             cleaned = []
-            artist_lower = artist.lower()
             artist_seen = False
             for part in parts:
                 part_stripped = part.strip()
-                part_lower = part_stripped.lower()
-                if part_lower.startswith(artist_lower):
-                    after = part_lower[len(artist_lower):]
-                    # Matches if: exact artist, OR artist followed by space/colon/comma
-                    # e.g. "Cypress Hill feat ..." or "Boyz II Men: Album" or "Boyz II Men"
-                    is_artist_variant = (after == "" or after[0] in " :,")
-                    if is_artist_variant:
-                        if not artist_seen:
-                            artist_seen = True
-                            cleaned.append(part_stripped)  # Keep first occurrence
-                        else:
-                            continue  # Skip duplicate
-                    else:
-                        cleaned.append(part_stripped)
-                else:
-                    cleaned.append(part_stripped)
+                if artist_re.match(part_stripped):
+                    if artist_seen:
+                        continue  # Skip duplicate
+                    artist_seen = True  # Keep first occurrence
+                cleaned.append(part_stripped)
             result = " - ".join(cleaned)
         if strip_var.get():
             result = apply_strip_punctuation(result)
@@ -1595,8 +1976,6 @@ def open_custom_search():
     tk.Checkbutton(
         win, text="Remove duplicate artist  (e.g.  \"Adele: 21 - Adele - Someone Like You\"  →  \"Adele: 21 - Someone Like You\")",
         variable=dedup_var,
-        bg=t["bg"], fg=t["fg"], selectcolor=t["bg"],
-        activebackground=t["bg"], activeforeground=t["fg"],
         font=("Segoe UI", 8),
         command=on_dedup_toggle,
         wraplength=540, justify="left"
@@ -1605,14 +1984,12 @@ def open_custom_search():
     tk.Checkbutton(
         win, text="Strip punctuation  (e.g.  \"Guns N' Roses - Don't Cry\"  →  \"Guns N Roses - Dont Cry\")",
         variable=strip_var,
-        bg=t["bg"], fg=t["fg"], selectcolor=t["bg"],
-        activebackground=t["bg"], activeforeground=t["fg"],
         font=("Segoe UI", 8),
         command=on_strip_toggle,
         wraplength=540, justify="left"
     ).pack(anchor="w", padx=12, pady=(0, 6))
 
-    btns = tk.Frame(win, bg=t["bg"])
+    btns = tk.Frame(win, bg=t.bg)
     btns.pack(fill="x", padx=12, pady=8)
 
     def run_custom():
@@ -1621,16 +1998,11 @@ def open_custom_search():
             return
 
         def worker():
-            global downloading, cancel_requested
-            cancel_requested = False
+            global downloading
+            cancel_event.clear()
             downloading = True
 
-            ui_call(dl_btn.configure, {"state": "disabled"})
-            ui_call(open_btn.configure, {"state": "disabled"})
-            ui_call(custom_btn.configure, {"state": "disabled"})
-            ui_call(missing_scan_btn.configure, {"state": "disabled"})
-            ui_call(missing_dl_btn.configure, {"state": "disabled"})
-            ui_call(cancel_btn.configure, {"state": "normal"})
+            ui_call(_set_buttons_state, "disabled")
 
             lrc = os.path.splitext(song_path)[0] + ".lrc"
             lrc = os.path.splitext(song_path)[0] + ".lrc"
@@ -1685,21 +2057,13 @@ def open_custom_search():
             artist = infer_artist_from_path(song_path)
             if artist:
                 scanned_artists.add(artist)
-                ap = os.path.join(MUSIC_DIR, artist)
-                keys_to_remove = [k for k in lyrics_cache.keys() if isinstance(k, tuple) and k[0].startswith(ap)]
-                for k in keys_to_remove:
-                    lyrics_cache.pop(k, None)
+                invalidate_artist_cache(artist)
             
             ui_call(refresh_artist_list, True)
             ui_call(refresh_current_view)
 
             downloading = False
-            ui_call(dl_btn.configure, {"state": "normal"})
-            ui_call(open_btn.configure, {"state": "normal"})
-            ui_call(custom_btn.configure, {"state": "normal"})
-            ui_call(missing_scan_btn.configure, {"state": "normal"})
-            ui_call(missing_dl_btn.configure, {"state": "normal"})
-            ui_call(cancel_btn.configure, {"state": "disabled"})
+            ui_call(_set_buttons_state, "normal")
             set_status("Done.")
 
         win.destroy()
@@ -1707,14 +2071,14 @@ def open_custom_search():
 
     tk.Button(
         btns, text="Download using this query", command=run_custom,
-        bg=t["btn_bg"], fg=t["btn_fg"],
-        activebackground=t["btn_bg"], activeforeground=t["btn_fg"]
+        bg=t.btn_bg, fg=t.btn_fg,
+        activebackground=t.btn_bg, activeforeground=t.btn_fg
     ).pack(side="left")
 
     tk.Button(
         btns, text="Cancel", command=win.destroy,
-        bg=t["btn_bg"], fg=t["btn_fg"],
-        activebackground=t["btn_bg"], activeforeground=t["btn_fg"]
+        bg=t.btn_bg, fg=t.btn_fg,
+        activebackground=t.btn_bg, activeforeground=t.btn_fg
     ).pack(side="right")
 
 
@@ -1724,13 +2088,13 @@ def about():
     t = THEMES[config.get("theme", "dark")]
     win = tk.Toplevel(root)
     win.title("About")
-    win.configure(bg=t["bg"])
+    win.configure(bg=t.bg)
     win.grab_set()
     popup_over_root(win, 760, 560)
 
     tk.Label(
         win, text=APP_NAME,
-        bg=t["bg"], fg=t["fg"],
+        bg=t.bg, fg=t.fg,
         font=("Segoe UI", 14, "bold")
     ).pack(anchor="w", padx=14, pady=(14, 6))
 
@@ -1760,49 +2124,71 @@ def about():
 
     tk.Label(
         win, text=body, justify="left",
-        bg=t["bg"], fg=t["fg"],
+        bg=t.bg, fg=t.fg,
         font=("Segoe UI", 10)
     ).pack(anchor="w", padx=14)
 
     link_lbl = tk.Label(
         win, text="syncedlyrics on PyPI",
-        bg=t["bg"], fg=t["link_fg"],
+        bg=t.bg, fg=t.link_fg,
         cursor="hand2",
         font=("Segoe UI", 10, "underline")
     )
     link_lbl.pack(anchor="w", padx=14, pady=(10, 10))
     link_lbl.bind("<Button-1>", lambda e: open_syncedlyrics())
 
-    btns = tk.Frame(win, bg=t["bg"])
+    btns = tk.Frame(win, bg=t.bg)
     btns.pack(fill="x", padx=14, pady=14)
 
     tk.Button(
         btns, text="Open GitHub", command=open_github,
-        bg=t["btn_bg"], fg=t["btn_fg"],
-        activebackground=t["btn_bg"], activeforeground=t["btn_fg"]
+        bg=t.btn_bg, fg=t.btn_fg,
+        activebackground=t.btn_bg, activeforeground=t.btn_fg
     ).pack(side="left")
 
     tk.Button(
         btns, text="Close", command=win.destroy,
-        bg=t["btn_bg"], fg=t["btn_fg"],
-        activebackground=t["btn_bg"], activeforeground=t["btn_fg"]
+        bg=t.btn_bg, fg=t.btn_fg,
+        activebackground=t.btn_bg, activeforeground=t.btn_fg
     ).pack(side="right")
 
 
 # ------------------ Options Window (WITH PRIORITY REORDERING) ------------------
 
+_options_win = None     # Built on first open, then hidden and re-shown
+_options_theme = None   # Theme it was built with - a theme switch rebuilds it
+_options_reload = None  # Resets its widgets from config before each re-show
+
+
 def open_options_window():
+    global _options_win, _options_theme, _options_reload
     if downloading:
         messagebox.showinfo("Busy", "Wait for the current download to finish first.")
         return
 
-    t = THEMES[config.get("theme", "dark")]
+    theme = config.get("theme", "dark")
+    if _options_win is not None and _options_win.winfo_exists():
+        if _options_theme == theme:
+            _options_reload()
+            _options_win.deiconify()
+            popup_over_root(_options_win, 880, 590)
+            _options_win.grab_set()
+            return
+        _options_win.destroy()
+
+    t = THEMES[theme]
     win = tk.Toplevel(root)
     win.title("Options")
-    win.configure(bg=t["bg"])
+    win.configure(bg=t.bg)
     win.grab_set()
     popup_over_root(win, 880, 590)
 
+    def hide():
+        win.grab_release()
+        win.withdraw()
+
+    win.protocol("WM_DELETE_WINDOW", hide)
+
     enabled_map = dict(config.get("providers_enabled", {p: True for p in ALL_PROVIDERS}))
     order = list(config.get("providers_order", ALL_PROVIDERS))
     lang = config.get("lang", "en")
@@ -1811,44 +2197,54 @@ def open_options_window():
     reject_non_ascii = bool(config.get("reject_non_ascii", True))
     ratio = float(config.get("reject_non_ascii_ratio", 0.15))
 
-    frm = tk.Frame(win, bg=t["bg"])
+    frm = tk.Frame(win, bg=t.bg)
     frm.pack(fill="both", expand=True, padx=12, pady=12)
 
-    left = tk.Frame(frm, bg=t["bg"])
+    left = tk.Frame(frm, bg=t.bg)
     left.pack(side="left", fill="y")
 
-    mid = tk.Frame(frm, bg=t["bg"])
+    mid = tk.Frame(frm, bg=t.bg)
     mid.pack(side="left", fill="both", expand=True, padx=(12, 0))
 
-    tk.Label(left, text="Providers", bg=t["bg"], fg=t["fg"], font=("Segoe UI", 11, "bold")).pack(anchor="w")
+    tk.Label(left, text="Providers", bg=t.bg, fg=t.fg, font=("Segoe UI", 11, "bold")).pack(anchor="w")
 
     plain_var = tk.BooleanVar(value=plain_ok)
     provider_vars = {}
 
-    tk.Label(mid, text="Priority (top = tried first)", bg=t["bg"], fg=t["fg"],
+    tk.Label(mid, text="Priority (top = tried first)", bg=t.bg, fg=t.fg,
              font=("Segoe UI", 11, "bold")).pack(anchor="w")
 
-    pri_frame = tk.Frame(mid, bg=t["bg"])
+    pri_frame = tk.Frame(mid, bg=t.bg)
     pri_frame.pack(fill="both", expand=True)
 
     pri_list = tk.Listbox(
         pri_frame, exportselection=False,
-        bg=t["panel"], fg=t["fg"],
-        selectbackground=t["sel_bg"], selectforeground=t["sel_fg"],
-        highlightbackground=t["border"], highlightcolor=t["border"]
+        bg=t.panel, fg=t.fg,
+        selectbackground=t.sel_bg, selectforeground=t.sel_fg,
+        highlightbackground=t.border, highlightcolor=t.border
     )
     pri_scroll = tk.Scrollbar(pri_frame, orient="vertical", command=pri_list.yview)
     pri_list.configure(yscrollcommand=pri_scroll.set)
     pri_list.pack(side="left", fill="both", expand=True)
     pri_scroll.pack(side="right", fill="y")
 
+    rendered = []  # Rows currently in pri_list, so a toggle/move only rewrites what changed
+
     def render_priority_list(select_index=None):
-        pri_list.delete(0, tk.END)
-        for p in order:
-            is_enabled = bool(provider_vars[p].get())
-            if p == "Genius" and not plain_var.get():
-                is_enabled = False
-            pri_list.insert(tk.END, f"✔ {p}" if is_enabled else f"✖ {p} (disabled)")
+        # One Tcl read per variable; Genius isn't even read while plain is off
+        plain_on = plain_var.get()
+        enabled = {p: (plain_on or p != "Genius") and bool(provider_vars[p].get()) for p in order}
+        rows = [f"✔ {p}" if enabled[p] else f"✖ {p} (disabled)" for p in order]
+        if len(rows) == len(rendered):
+            for i, row in enumerate(rows):
+                if row != rendered[i]:
+                    pri_list.delete(i)
+                    pri_list.insert(i, row)
+        else:
+            pri_list.delete(0, tk.END)
+            pri_list.insert(tk.END, *rows)
+        rendered[:] = rows
+        pri_list.selection_clear(0, tk.END)
         if select_index is not None and 0 <= select_index < pri_list.size():
             pri_list.selection_set(select_index)
             pri_list.activate(select_index)
@@ -1862,25 +2258,19 @@ def open_options_window():
     tk.Checkbutton(
         left, text="Allow plain lyrics fallback",
         variable=plain_var,
-        bg=t["bg"], fg=t["fg"], selectcolor=t["bg"],
-        activebackground=t["bg"], activeforeground=t["fg"],
         command=on_toggle_plain
     ).pack(anchor="w", pady=(0, 6))
     
     upgrade_var = tk.BooleanVar(value=config.get("upgrade_plain_to_synced", True))
     tk.Checkbutton(
         left, text="Auto-upgrade plain → synced (prompt for each)",
-        variable=upgrade_var,
-        bg=t["bg"], fg=t["fg"], selectcolor=t["bg"],
-        activebackground=t["bg"], activeforeground=t["fg"]
+        variable=upgrade_var
     ).pack(anchor="w", pady=(0, 6))
     
     auto_upgrade_var = tk.BooleanVar(value=config.get("auto_upgrade_plain", False))
     tk.Checkbutton(
         left, text="Auto-upgrade plain → synced (no prompt)",
-        variable=auto_upgrade_var,
-        bg=t["bg"], fg=t["fg"], selectcolor=t["bg"],
-        activebackground=t["bg"], activeforeground=t["fg"]
+        variable=auto_upgrade_var
     ).pack(anchor="w", pady=(0, 10))
 
     genius_cb = None
@@ -1896,8 +2286,6 @@ def open_options_window():
         provider_vars[p] = v
         cb = tk.Checkbutton(
             left, text=p, variable=v,
-            bg=t["bg"], fg=t["fg"], selectcolor=t["bg"],
-            activebackground=t["bg"], activeforeground=t["fg"],
             command=lambda name=p: on_toggle_provider(name)
         )
         cb.pack(anchor="w")
@@ -1910,7 +2298,7 @@ def open_options_window():
 
     render_priority_list(0 if order else None)
 
-    btns = tk.Frame(mid, bg=t["bg"])
+    btns = tk.Frame(mid, bg=t.bg)
     btns.pack(fill="x", pady=(6, 0))
 
     def move_up():
@@ -1934,58 +2322,51 @@ def open_options_window():
         render_priority_list(i + 1)
 
     tk.Button(btns, text="Up", command=move_up, width=10,
-              bg=t["btn_bg"], fg=t["btn_fg"], activebackground=t["btn_bg"], activeforeground=t["btn_fg"]).pack(side="left")
+              bg=t.btn_bg, fg=t.btn_fg, activebackground=t.btn_bg, activeforeground=t.btn_fg).pack(side="left")
     tk.Button(btns, text="Down", command=move_down, width=10,
-              bg=t["btn_bg"], fg=t["btn_fg"], activebackground=t["btn_bg"], activeforeground=t["btn_fg"]).pack(side="left", padx=(8, 0))
+              bg=t.btn_bg, fg=t.btn_fg, activebackground=t.btn_bg, activeforeground=t.btn_fg).pack(side="left", padx=(8, 0))
 
-    bottom_opts = tk.Frame(win, bg=t["bg"])
+    bottom_opts = tk.Frame(win, bg=t.bg)
     bottom_opts.pack(fill="x", padx=12, pady=(10, 12))
 
-    tk.Label(bottom_opts, text="Lyrics Language:", bg=t["bg"], fg=t["fg"], font=("Segoe UI", 10, "bold")).grid(row=0, column=0, sticky="w")
+    tk.Label(bottom_opts, text="Lyrics Language:", bg=t.bg, fg=t.fg, font=("Segoe UI", 10, "bold")).grid(row=0, column=0, sticky="w")
     lang_var = tk.StringVar(value=lang)
     tk.Entry(bottom_opts, textvariable=lang_var, width=6,
-             bg=t["panel"], fg=t["fg"], insertbackground=t["fg"],
-             highlightbackground=t["border"], highlightcolor=t["border"]).grid(row=0, column=1, sticky="w", padx=(8, 0))
+             bg=t.panel, fg=t.fg, insertbackground=t.fg,
+             highlightbackground=t.border, highlightcolor=t.border).grid(row=0, column=1, sticky="w", padx=(8, 0))
     tk.Label(bottom_opts, text="(en, es, fr… or blank = auto)",
-             bg=t["bg"], fg=t["fg"]).grid(row=0, column=2, sticky="w", padx=(10, 0))
+             bg=t.bg, fg=t.fg).grid(row=0, column=2, sticky="w", padx=(10, 0))
 
     strip_var = tk.BooleanVar(value=strip_cjk)
     tk.Checkbutton(
         bottom_opts, text="Strip CJK lines from downloaded LRC (optional cleanup)",
-        variable=strip_var, bg=t["bg"], fg=t["fg"], selectcolor=t["bg"],
-        activebackground=t["bg"], activeforeground=t["fg"]
+        variable=strip_var
     ).grid(row=1, column=0, columnspan=3, sticky="w", pady=(10, 0))
 
     rej_var = tk.BooleanVar(value=reject_non_ascii)
     tk.Checkbutton(
         bottom_opts, text="Reject lyrics files that are mostly non-ASCII (good for English)",
-        variable=rej_var, bg=t["bg"], fg=t["fg"], selectcolor=t["bg"],
-        activebackground=t["bg"], activeforeground=t["fg"]
+        variable=rej_var
     ).grid(row=2, column=0, columnspan=3, sticky="w", pady=(6, 0))
 
-    tk.Label(bottom_opts, text="Reject threshold (0.05–0.50):", bg=t["bg"], fg=t["fg"]).grid(row=3, column=0, sticky="w", pady=(6, 0))
+    tk.Label(bottom_opts, text="Reject threshold (0.05–0.50):", bg=t.bg, fg=t.fg).grid(row=3, column=0, sticky="w", pady=(6, 0))
     ratio_var = tk.StringVar(value=str(ratio))
-    tk.Entry(bottom_opts, textvariable=ratio_var, width=8,
-             bg=t["panel"], fg=t["fg"], insertbackground=t["fg"],
-             highlightbackground=t["border"], highlightcolor=t["border"]).grid(row=3, column=1, sticky="w", padx=(8, 0), pady=(6, 0))
+    tk.Spinbox(bottom_opts, textvariable=ratio_var, width=8,
+               from_=0.05, to=0.50, increment=0.05, format="%.2f",
+               validate="key", validatecommand=(win.register(lambda s: RATIO_INPUT_RE.fullmatch(s) is not None), "%P"),
+               bg=t.panel, fg=t.fg, insertbackground=t.fg, buttonbackground=t.panel,
+               highlightbackground=t.border, highlightcolor=t.border).grid(row=3, column=1, sticky="w", padx=(8, 0), pady=(6, 0))
 
-    footer = tk.Frame(win, bg=t["bg"])
+    footer = tk.Frame(win, bg=t.bg)
     footer.pack(fill="x", padx=12, pady=12)
 
     def on_save():
-        fixed, seen = [], set()
-        for p in order:
-            if p in ALL_PROVIDERS and p not in seen:
-                fixed.append(p); seen.add(p)
-        for p in ALL_PROVIDERS:
-            if p not in seen:
-                fixed.append(p)
+        # User order first (unknown names dropped), then any provider it's missing
+        fixed = list(dict.fromkeys([*(p for p in order if p in _PROVIDER_SET), *ALL_PROVIDERS]))
 
-        try:
-            r = float(ratio_var.get())
-            r = max(0.05, min(0.50, r))
-        except:
-            r = 0.15
+        # The validator only lets digits/one dot through; a lone "." or "" means default
+        r_text = ratio_var.get()
+        r = max(0.05, min(0.50, float(r_text) if r_text.strip(".") else 0.15))
 
         plain = bool(plain_var.get())
         if not plain:
@@ -2002,19 +2383,59 @@ def open_options_window():
         config["reject_non_ascii_ratio"] = r
 
         save_config(config)
-        lyrics_cache.clear()
+        # No option changes how many tracks have lyrics, and load_artists prunes
+        # stale scan results itself - keeping them spares a full rescan
         missing_targets.clear()
-        win.destroy()
-        load_artists()
+        hide()
+        root.after_idle(load_artists)  # Let the window go away before the reload
+
+    def reload_from_config():
+        """Discard unsaved edits: put every control back to what config holds."""
+        enabled = config.get("providers_enabled", {})
+        order[:] = list(config.get("providers_order", ALL_PROVIDERS))
+        plain = bool(config.get("allow_plain_fallback", False))
+        plain_var.set(plain)
+        upgrade_var.set(config.get("upgrade_plain_to_synced", True))
+        auto_upgrade_var.set(config.get("auto_upgrade_plain", False))
+        for p, v in provider_vars.items():
+            v.set(enabled.get(p, True))
+        genius_cb.configure(state=("normal" if plain else "disabled"))
+        if not plain:
+            provider_vars["Genius"].set(False)
+        lang_var.set(config.get("lang", "en"))
+        strip_var.set(bool(config.get("strip_cjk", True)))
+        rej_var.set(bool(config.get("reject_non_ascii", True)))
+        ratio_var.set(str(float(config.get("reject_non_ascii_ratio", 0.15))))
+        render_priority_list(0 if order else None)
+
+    _options_win, _options_theme, _options_reload = win, theme, reload_from_config
 
-    tk.Button(footer, text="Cancel", command=win.destroy, width=10,
-              bg=t["btn_bg"], fg=t["btn_fg"], activebackground=t["btn_bg"], activeforeground=t["btn_fg"]).pack(side="right")
+    tk.Button(footer, text="Cancel", command=hide, width=10,
+              bg=t.btn_bg, fg=t.btn_fg, activebackground=t.btn_bg, activeforeground=t.btn_fg).pack(side="right")
     tk.Button(footer, text="Save", command=on_save, width=10,
-              bg=t["btn_bg"], fg=t["btn_fg"], activebackground=t["btn_bg"], activeforeground=t["btn_fg"]).pack(side="right", padx=(0, 8))
+              bg=t.btn_bg, fg=t.btn_fg, activebackground=t.btn_bg, activeforeground=t.btn_fg).pack(side="right", padx=(0, 8))
 
 
 # ------------------ Selection helpers ------------------
 
+_select_jobs = {}  # {handler: after_idle id} while a selection change is pending
+
+
+def deferred_select(handler):
+    """<<ListboxSelect>> binding that runs handler once per burst of events.
+    Drag-selecting across many rows fires the event on every step; only the
+    settled selection needs the album/track lists rebuilt."""
+    def schedule(event=None):
+        if handler not in _select_jobs:
+            _select_jobs[handler] = root.after_idle(_run_select, handler)
+    return schedule
+
+
+def _run_select(handler):
+    _select_jobs.pop(handler, None)
+    handler(None)
+
+
 def select_all_in_listbox(lb: tk.Listbox):
     if lb.size() > 0:
         lb.selection_set(0, tk.END)
@@ -2129,79 +2550,65 @@ def bind_ctrl_a(lb: tk.Listbox):
 
 def apply_theme(theme_name: str):
     t = THEMES[theme_name]
-
-    root.configure(bg=t["bg"])
-    top.configure(bg=t["bg"])
-    main.configure(bg=t["bg"])
-    bottom.configure(bg=t["bg"])
-    list_frame.configure(bg=t["bg"])
-    btn_row.configure(bg=t["bg"])
-    legend_row.configure(bg=t["bg"])
-    status_bar.configure(bg=t["status_bg"])
+    # One option dict per widget group, built once per switch
+    bg_kw = {"bg": t.bg}
+    btn_kw = {"bg": t.btn_bg, "fg": t.btn_fg,
+              "activebackground": t.btn_bg, "activeforeground": t.btn_fg}
+    border_kw = {"highlightbackground": t.border, "highlightcolor": t.border}
+    header_kw = {"bg": t.panel}
+    title_kw = {"bg": t.panel, "fg": t.fg}
+    list_kw = {"bg": t.panel, "fg": t.fg,
+               "selectbackground": t.sel_bg, "selectforeground": t.sel_fg, **border_kw}
+
+    for w in (root, top, main, bottom, list_frame, btn_row, legend_row):
+        w.configure(**bg_kw)
+    status_bar.configure(bg=t.status_bg)
     
     # Theme list cards
     for card in (artist_card, album_card, track_card):
-        card.configure(bg=t["bg"], highlightbackground=t["border"], highlightcolor=t["border"])
+        card.configure(**bg_kw, **border_kw)
     
     # Theme card headers
     for header in (artist_header, album_header, track_header):
-        header.configure(bg=t["panel"])
+        header.configure(**header_kw)
     
     # Theme title labels
     for title_lbl in (artist_title, album_title, track_title):
-        title_lbl.configure(bg=t["panel"], fg=t["fg"])
+        title_lbl.configure(**title_kw)
     
-    # Theme Select All buttons
-    for btn in (artist_select_btn, album_select_btn, track_select_btn):
-        btn.configure(bg=t["btn_bg"], fg=t["btn_fg"], 
-                     activebackground=t["btn_bg"], activeforeground=t["btn_fg"])
-
-    open_btn.configure(bg=t["btn_bg"], fg=t["btn_fg"], activebackground=t["btn_bg"], activeforeground=t["btn_fg"])
+    # Select All buttons and the action buttons share one look
+    for btn in (artist_select_btn, album_select_btn, track_select_btn,
+                open_btn, dl_btn, cancel_btn, custom_btn, missing_scan_btn, missing_dl_btn, clear_btn):
+        btn.configure(**btn_kw)
     
     # Theme search widgets in top bar
-    search_label.configure(bg=t["bg"], fg=t["fg"])
-    search_entry.configure(
-        bg=t["panel"], fg=t["fg"],
-        insertbackground=t["fg"],
-        highlightbackground=t["border"], highlightcolor=t["border"]
-    )
-    
-    dl_btn.configure(bg=t["btn_bg"], fg=t["btn_fg"], activebackground=t["btn_bg"], activeforeground=t["btn_fg"])
-    cancel_btn.configure(bg=t["btn_bg"], fg=t["btn_fg"], activebackground=t["btn_bg"], activeforeground=t["btn_fg"])
-    custom_btn.configure(bg=t["btn_bg"], fg=t["btn_fg"], activebackground=t["btn_bg"], activeforeground=t["btn_fg"])
-    missing_scan_btn.configure(bg=t["btn_bg"], fg=t["btn_fg"], activebackground=t["btn_bg"], activeforeground=t["btn_fg"])
-    missing_dl_btn.configure(bg=t["btn_bg"], fg=t["btn_fg"], activebackground=t["btn_bg"], activeforeground=t["btn_fg"])
-    clear_btn.configure(bg=t["btn_bg"], fg=t["btn_fg"], activebackground=t["btn_bg"], activeforeground=t["btn_fg"])
+    search_label.configure(bg=t.bg, fg=t.fg)
+    search_entry.configure(bg=t.panel, fg=t.fg, insertbackground=t.fg, **border_kw)
 
     for lb in (artist_list, album_list, track_list):
-        lb.configure(
-            bg=t["panel"], fg=t["fg"],
-            selectbackground=t["sel_bg"], selectforeground=t["sel_fg"],
-            highlightbackground=t["border"], highlightcolor=t["border"]
-        )
+        lb.configure(**list_kw)
 
-    log_box.configure(
-        bg=t["log_bg"], fg=t["log_fg"],
-        insertbackground=t["log_fg"],
-        highlightbackground=t["border"], highlightcolor=t["border"]
-    )
+    log_box.configure(bg=t.log_bg, fg=t.log_fg, insertbackground=t.log_fg, **border_kw)
+
+    status_label.configure(bg=t.status_bg, fg=t.status_fg)
 
-    status_label.configure(bg=t["status_bg"], fg=t["status_fg"])
+    legend_bg = t.legend_bg
+    legend_frame.configure(bg=legend_bg, highlightbackground=t.legend_border, highlightthickness=1)
+    for lbl, fg_key in ((legend_title, "fg"), (legend_artist_ok, "ok"), (legend_artist_some, "warn"),
+                        (legend_artist_none, "none"), (legend_track_synced, "ok"), (legend_track_plain, "plain"),
+                        (legend_track_incomp, "incomp"), (legend_track_none, "none")):
+        lbl.configure(bg=legend_bg, fg=getattr(t, fg_key))
 
-    legend_frame.configure(bg=t["legend_bg"], highlightbackground=t["legend_border"], highlightthickness=1)
-    legend_title.configure(bg=t["legend_bg"], fg=t["fg"])
-    legend_artist_ok.configure(bg=t["legend_bg"], fg=t["ok"])
-    legend_artist_some.configure(bg=t["legend_bg"], fg=t["warn"])
-    legend_artist_none.configure(bg=t["legend_bg"], fg=t["none"])
-    legend_track_synced.configure(bg=t["legend_bg"], fg=t["ok"])
-    legend_track_plain.configure(bg=t["legend_bg"], fg=t["plain"])
-    legend_track_incomp.configure(bg=t["legend_bg"], fg=t["incomp"])
-    legend_track_none.configure(bg=t["legend_bg"], fg=t["none"])
+    # Checkbuttons only live in dialogs, which are built later - let them pick
+    # their colours up from the option database instead of passing them each time
+    for opt, key in (("background", "bg"), ("foreground", "fg"), ("selectColor", "bg"),
+                     ("activeBackground", "bg"), ("activeForeground", "fg")):
+        root.option_add(f"*Checkbutton.{opt}", getattr(t, key))
 
     set_titlebar_theme(theme_name == "dark")
 
     config["theme"] = theme_name
-    save_config(config)
+    schedule_save_config()
 
 
 # ------------------ UI build ------------------
@@ -2219,11 +2626,21 @@ except:
 def save_window_geometry():
     try:
         config["window_geometry"] = root.geometry()
-        save_config()
+        flush_config()  # Also writes any change still waiting on the debounce
     except:
         pass
 
-root.protocol("WM_DELETE_WINDOW", lambda: [save_window_geometry(), root.destroy()])
+def on_close():
+    save_window_geometry()
+    # Pool workers aren't daemon threads - without this a closed window keeps
+    # downloading until the whole queue is done
+    cancel_event.set()
+    _SCAN_POOL.shutdown(wait=False, cancel_futures=True)
+    if _download_pool is not None:
+        _download_pool.shutdown(wait=False, cancel_futures=True)
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", on_close)
 
 menubar = tk.Menu(root)
 
@@ -2258,7 +2675,22 @@ search_var = tk.StringVar(value="")
 search_entry = tk.Entry(top, textvariable=search_var, width=30)
 search_entry.pack(side="left")
 
+_search_job = None
+
+
 def on_search(*_):
+    # Debounced so a burst of keystrokes rebuilds the list once
+    global _search_job
+    if _search_job is not None:
+        root.after_cancel(_search_job)
+    _search_job = root.after(120, _run_search)
+
+
+def _run_search():
+    global _search_job
+    _search_job = None
+    if search_var.get().strip().lower() == _rendered_query:
+        return  # e.g. a typo typed and deleted again - the list already matches
     rebuild_artist_list_filtered(keep_selection_name=get_selected_artist_name())
 
 search_var.trace_add("write", on_search)
@@ -2315,16 +2747,14 @@ artist_card.pack(side="left", fill="both", padx=(0, 6), pady=4)
 album_card.pack(side="left", fill="both", padx=(0, 6), pady=4)
 track_card.pack(side="left", fill="both", padx=(0, 0), pady=4, expand=True)
 
-artist_list.bind("<<ListboxSelect>>", on_artist_select)
-album_list.bind("<<ListboxSelect>>", on_album_select)
+artist_list.bind("<<ListboxSelect>>", deferred_select(on_artist_select))
+album_list.bind("<<ListboxSelect>>", deferred_select(on_album_select))
 
 def on_track_select(event=None):
     # Update track button text based on selection
-    if track_list.curselection():
-        if len(track_list.curselection()) == track_list.size() and track_list.size() > 0:
-            track_select_btn.configure(text="Clear All")
-        else:
-            track_select_btn.configure(text="Select All")
+    sel = track_list.curselection()
+    if sel and len(sel) == track_list.size():
+        track_select_btn.configure(text="Clear All")
     else:
         track_select_btn.configure(text="Select All")
 
@@ -2424,6 +2854,9 @@ create_tooltip(track_select_btn, "Select/Clear all tracks")
 
 pump_ui_queue()
 
+load_lyrics_cache()
+atexit.register(save_lyrics_cache)
+
 if MUSIC_DIR and os.path.isdir(MUSIC_DIR):
     load_artists()
 else: